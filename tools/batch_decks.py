@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Write one proposal deck per client across worker processes.
+
+Usage: python tools/batch_decks.py tools/specs/clients.json [--workers N] [--out DIR]
+
+The clients file names a base deck spec and the parameter sets to build
+it with (see the "params" section of the deck spec for what exists):
+
+    {
+      "base": "deloitte_deck.json",            # relative to the clients file
+      "output_dir": "../../build/decks",
+      "filename": "${client}_AI_Training_Proposal.pptx",
+      "clients": [{"client": "PurposeMed", "price": "$40,000",
+                   "client_logo": "assets/images/logos/purposemed-logo.png"}, ...]
+    }
+
+python-pptx is imported once in the parent; each worker parses the base
+spec and serializes the blank presentation template into memory once,
+then builds every deck it is handed from those.
+"""
+import argparse
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+
+import pptx
+from pptx import Presentation
+
+from create_pptx import SOURCES
+from deck_engine import build_deck, resolve_deck
+from deck_images import image_files, media_footprint
+from render_cache import DEFAULT_ROOT, RenderCache
+from spec_files import load_spec
+
+# Per-worker state, set up once by _init_worker
+_base_spec = None
+_template = None
+_cache = None
+
+
+def _init_worker(base_path, cache_root):
+    global _base_spec, _template, _cache
+    _base_spec = load_spec(base_path)
+    buf = io.BytesIO()
+    Presentation().save(buf)
+    _template = buf.getvalue()
+    _cache = RenderCache(cache_root) if cache_root else None
+
+
+def _build_one(job):
+    """Worker: build one client's deck, returning (path, seconds, cache_hit)"""
+    params, path = job
+    start = time.perf_counter()
+    if _cache is not None:
+        key = _cache.key({'deck': _base_spec, 'params': params, 'python-pptx': pptx.__version__},
+                         code=SOURCES + image_files(resolve_deck(_base_spec, params)))
+        if _cache.fetch(key, path):
+            return path, time.perf_counter() - start, True
+    prs = build_deck(_base_spec, Presentation(io.BytesIO(_template)), params)
+    prs.save(path)
+    if _cache is not None:
+        _cache.store(key, path)
+    return path, time.perf_counter() - start, False
+
+
+def output_name(pattern, params):
+    """Fill the filename pattern and make it filesystem-safe"""
+    name = Template(pattern).safe_substitute(params)
+    return re.sub(r'[^\w.-]+', '_', name)
+
+
+def build_all(base_path, clients, output_dir, pattern, workers=None, cache_root=DEFAULT_ROOT):
+    """Build every client deck across a process pool and report decks/second"""
+    os.makedirs(output_dir, exist_ok=True)
+    defaults = load_spec(base_path).get('params', {})
+    jobs = [(params, os.path.join(output_dir, output_name(pattern, {**defaults, **params})))
+            for params in clients]
+    if len({path for _, path in jobs}) != len(jobs):
+        raise ValueError(f"Filename pattern {pattern!r} gives several clients the same output file")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(base_path, cache_root)) as pool:
+        for path, seconds, hit in pool.map(_build_one, jobs):
+            count, media_bytes = media_footprint(path)
+            print(f"  {seconds * 1000:7.1f}ms  {'cached' if hit else 'built '}  {path}  "
+                  f"({media_bytes / 1024:.0f}KB media in {count} files)")
+            results.append((path, seconds, hit))
+    elapsed = time.perf_counter() - start
+
+    hits = sum(1 for *_, hit in results if hit)
+    print(f"Wrote {len(results)} decks in {elapsed:.2f}s ({len(results) / elapsed:.1f} decks/s, "
+          f"{hits} from cache)")
+    if cache_root:
+        RenderCache(cache_root).evict()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build one proposal deck per client")
+    parser.add_argument('clients', help='JSON or YAML clients file')
+    parser.add_argument('--out', help='output directory (overrides the clients file)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='always rebuild')
+    args = parser.parse_args(argv)
+
+    config = load_spec(args.clients)
+    here = os.path.dirname(os.path.abspath(args.clients))
+    base_path = os.path.join(here, config['base'])
+    output_dir = args.out or os.path.normpath(os.path.join(here, config.get('output_dir', 'build')))
+    pattern = config.get('filename', '${client}_AI_Training_Proposal.pptx')
+    build_all(base_path, config['clients'], output_dir, pattern, args.workers,
+              cache_root=None if args.no_cache else DEFAULT_ROOT)
+
+
+if __name__ == '__main__':
+    main()
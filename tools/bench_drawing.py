@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the drawing primitives in drawing.py.
+
+Usage: python tools/bench_drawing.py [--repeat 200]
+
+Each primitive is timed against the inline code the cover script used
+before it moved to drawing.py, on a copy of a 1584x396 canvas, and the
+two results are checked for pixel equality.
+"""
+import argparse
+import time
+
+from PIL import Image, ImageDraw
+
+from drawing import draw_grid, draw_pills, draw_text_lines, gradient_bar, text_size
+from fonts import get_font
+
+SIZE = (1584, 396)
+PILLS = [
+    ("Live Builds", (59, 130, 246)),
+    ("Your Tools", (139, 92, 246)),
+    ("Measurable ROI", (16, 185, 129)),
+]
+HEADLINE = ["Bridge the Enterprise", "AI Skills Gap"]
+
+
+def old_gradient_bar(img, draw, font):
+    for bar_x in range(450, 650):
+        progress = (bar_x - 450) / 200
+        r = int(59 + progress * (139 - 59))
+        g = int(130 + progress * (92 - 130))
+        b = int(246 + progress * (246 - 246))
+        draw.line([(bar_x, 280), (bar_x, 284)], fill=(r, g, b), width=1)
+
+
+def new_gradient_bar(img, draw, font):
+    gradient_bar(img, (450, 280, 650, 285), (59, 130, 246), (139, 92, 246))
+
+
+def old_grid(img, draw, font):
+    for x in range(0, SIZE[0], 60):
+        draw.line([(x, 0), (x, SIZE[1])], fill=(30, 41, 59), width=1)
+    for y in range(0, SIZE[1], 60):
+        draw.line([(0, y), (SIZE[0], y)], fill=(30, 41, 59), width=1)
+
+
+def new_grid(img, draw, font):
+    draw_grid(draw, SIZE, 60, (30, 41, 59))
+
+
+def old_metrics(img, draw, font):
+    for text, _ in PILLS:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox[2] - bbox[0]
+
+
+def new_metrics(img, draw, font):
+    for text, _ in PILLS:
+        text_size(font, text)
+
+
+def old_pills(img, draw, font):
+    for i, (text, color) in enumerate(PILLS):
+        pill_x, pill_y = 1100, 90 + i * 55
+        bg_color = (color[0]//4, color[1]//4, color[2]//4)
+        draw.rounded_rectangle([(pill_x, pill_y), (pill_x + 160, pill_y + 32)], radius=16, fill=bg_color)
+        text_color = (min(color[0] + 60, 255), min(color[1] + 60, 255), min(color[2] + 60, 255))
+        bbox = draw.textbbox((0, 0), text, font=font)
+        draw.text((pill_x + (160 - (bbox[2] - bbox[0])) // 2, pill_y + 7), text, fill=text_color, font=font)
+
+
+def new_pills(img, draw, font):
+    draw_pills(draw, PILLS, font, (1100, 90), (0, 55))
+
+
+def old_text(img, draw, font):
+    for i, line in enumerate(HEADLINE):
+        draw.text((450, 100 + i * 60), line, fill='#ffffff' if i == 0 else '#818cf8', font=font)
+
+
+def new_text(img, draw, font):
+    draw_text_lines(draw, (450, 100), HEADLINE, font, ['#ffffff', '#818cf8'], 60)
+
+
+BENCHMARKS = [
+    ('gradient_bar', old_gradient_bar, new_gradient_bar, 16),
+    ('draw_grid', old_grid, new_grid, 16),
+    ('text_size', old_metrics, new_metrics, 16),
+    ('draw_pills', old_pills, new_pills, 16),
+    ('draw_text_lines', old_text, new_text, 48),
+]
+
+
+def run(fn, font, repeat):
+    """Best-of-`repeat` time of one call on a fresh canvas, and the final image"""
+    base = Image.new('RGBA', SIZE, (15, 23, 42, 255))
+    best = float('inf')
+    for _ in range(repeat):
+        img = base.copy()
+        draw = ImageDraw.Draw(img)
+        start = time.perf_counter()
+        fn(img, draw, font)
+        best = min(best, time.perf_counter() - start)
+    return best, img
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='calls per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'primitive':>16}  {'inline':>9}  {'drawing.py':>10}  {'speedup':>8}  identical")
+    for name, old, new, font_size in BENCHMARKS:
+        font = get_font('sans', 'regular', font_size)
+        old_s, old_img = run(old, font, args.repeat)
+        new_s, new_img = run(new, font, args.repeat)
+        identical = old_img.tobytes() == new_img.tobytes()
+        print(f"{name:>16}  {old_s * 1e6:>7.0f}us  {new_s * 1e6:>8.0f}us  "
+              f"{old_s / new_s:>7.1f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Compare the vectorized diagonal gradient against the old per-pixel loop.
+
+Usage: python tools/bench_gradients.py [--scales 1,2,4] [--skip-loop]
+"""
+import argparse
+import time
+
+from PIL import Image, ImageDraw
+
+from gradients import diagonal_gradient
+
+WIDTH = 1584
+HEIGHT = 396
+START = (15, 23, 42)
+END = (30, 41, 59)
+
+
+def loop_gradient(width, height):
+    """The original draw.point() loop from create_linkedin_cover.py"""
+    img = Image.new('RGB', (width, height), '#0f172a')
+    draw = ImageDraw.Draw(img)
+    for x in range(width):
+        for y in range(height):
+            factor = (x / width + y / height) / 2
+            r = int(15 + factor * 15)
+            g = int(23 + factor * 18)
+            b = int(42 + factor * 17)
+            draw.point((x, y), fill=(r, g, b))
+    return img
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,2,4', help='comma-separated size multipliers')
+    parser.add_argument('--skip-loop', action='store_true', help='only time the vectorized version')
+    args = parser.parse_args()
+
+    print(f"{'size':>12}  {'loop':>10}  {'vectorized':>10}  {'speedup':>8}  identical")
+    for scale in (int(s) for s in args.scales.split(',')):
+        width, height = WIDTH * scale, HEIGHT * scale
+        fast, fast_s = timed(diagonal_gradient, (width, height), START, END)
+        if args.skip_loop:
+            print(f"{f'{width}x{height}':>12}  {'-':>10}  {fast_s * 1000:>8.1f}ms  {'-':>8}  -")
+            continue
+        slow, slow_s = timed(loop_gradient, width, height)
+        identical = slow.tobytes() == fast.tobytes()
+        print(f"{f'{width}x{height}':>12}  {slow_s * 1000:>8.0f}ms  {fast_s * 1000:>8.1f}ms  "
+              f"{slow_s / fast_s:>7.0f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Stage timings, peak memory and output checks for the generators, against stored baselines.
+
+Usage: python tools/bench_regress.py [--only cover,og,deck] [--repeat 7] [--threshold 0.3] [--update]
+
+Cases:
+
+- cover: LinkedIn cover (background, decorations, text, encode)
+- og:    default OG image at 1x + 2x (background, decorations, text, scale, encode)
+- deck:  Deloitte proposal (construction, images, save)
+
+Each case runs in a fresh subprocess so peak RSS (ru_maxrss) is its own.
+Stage times are the fastest of --repeat runs (at least MIN_REPEAT when
+gating), measured through the ``timing.stage()`` markers in the
+generators, with every cache cleared between runs; interference only
+ever adds time, so the minimum is the stable statistic. Around each run
+the child also times a fixed calibration workload (calibrate()), and
+stages are compared as multiples of it, so a slower or busier machine
+doesn't read as a regression: a stage regresses when, relative to
+calibration, it is slower than its baseline by more than --threshold
+plus NOISE_MS at this machine's speed. The ms columns are information
+only. Peak RSS is compared as is. The total row
+sums top-level stages (deck images are prepared inside construction).
+
+Outputs are compared with goldens: pixel diff for images (skipped when the
+fonts on this machine differ from the ones the golden was made with) and
+shape-by-shape structure for decks. Baselines and goldens live in
+tools/benchmarks/; --update rewrites them from this machine. Exits 1 on
+any regression or output difference.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(TOOLS_DIR, 'benchmarks')
+BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+GOLDEN_DIR = os.path.join(BENCH_DIR, 'golden')
+CASES = ('cover', 'og', 'deck')
+
+THRESHOLD = 0.3
+# Allowed on top of --threshold: timer noise, about a scheduler time slice,
+# which a small stage can lose on a busy machine
+NOISE_MS = 5.0
+# Fewer runs than this leave the fastest one too likely to be a slow one
+MIN_REPEAT = 5
+CALIBRATION_LOOPS = 5
+
+
+def calibrate():
+    """Milliseconds for a fixed mix of the generators' kinds of work (fastest of a few loops)
+
+    Object churn in the interpreter (spec walking, python-pptx), a PNG
+    encode (zlib, like every image stage's output) and array math (the
+    NumPy backgrounds).
+    """
+    import numpy as np
+    from PIL import Image
+
+    ramp = np.linspace(0.0, 1.0, 320 * 320).reshape(320, 320)
+    image = Image.merge('RGB', [Image.fromarray((channel * 255).astype(np.uint8))
+                                for channel in (ramp, ramp.T, ramp * ramp.T)])
+    best = float('inf')
+    for _ in range(CALIBRATION_LOOPS):
+        start = time.perf_counter()
+        for batch in range(20):
+            shapes = [{'x': i % 13, 'text': f'shape {i}', 'runs': [i, str(i)]} for i in range(1000)]
+            sorted(shapes, key=lambda shape: (shape['x'], shape['text']))
+        image.save(io.BytesIO(), 'PNG')
+        for _ in range(8):
+            np.sqrt(ramp * ramp + 1.0).sum()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+# --- output checks -----------------------------------------------------------
+
+def image_diff(path, golden_path):
+    """Compare two images; returns (identical, detail)"""
+    import numpy as np
+    from PIL import Image
+
+    a = np.asarray(Image.open(path).convert('RGB'), dtype=np.int16)
+    b = np.asarray(Image.open(golden_path).convert('RGB'), dtype=np.int16)
+    if a.shape != b.shape:
+        return False, f"size {a.shape[1]}x{a.shape[0]} != golden {b.shape[1]}x{b.shape[0]}"
+    diff = np.abs(a - b).max(axis=2)
+    changed = int(np.count_nonzero(diff))
+    if not changed:
+        return True, "pixel-identical"
+    return False, f"{changed} pixels differ ({changed / diff.size:.2%}), max channel diff {int(diff.max())}"
+
+
+def deck_structure(prs):
+    """Slide size plus, per slide, each shape's type, geometry, text and XML digest"""
+    from lxml import etree
+
+    slides = []
+    for slide in prs.slides:
+        shapes = []
+        for shape in slide.shapes:
+            text = shape.text_frame.text if shape.has_text_frame else ''
+            xml = etree.tostring(shape._element)
+            shapes.append([str(shape.shape_type), shape.left, shape.top, shape.width, shape.height,
+                           hashlib.sha1(text.encode()).hexdigest()[:12], hashlib.sha1(xml).hexdigest()[:12]])
+        slides.append(shapes)
+    return {'size': [prs.slide_width, prs.slide_height], 'slides': slides}
+
+
+def structure_diff(current, golden):
+    """Compare deck structures; returns (identical, detail) naming the first difference"""
+    if current['size'] != golden['size']:
+        return False, f"slide size {current['size']} != golden {golden['size']}"
+    if len(current['slides']) != len(golden['slides']):
+        return False, f"{len(current['slides'])} slides != golden {len(golden['slides'])}"
+    fields = ('type', 'left', 'top', 'width', 'height', 'text', 'xml')
+    for n, (shapes, expected) in enumerate(zip(current['slides'], golden['slides']), 1):
+        if len(shapes) != len(expected):
+            return False, f"slide {n}: {len(shapes)} shapes != golden {len(expected)}"
+        for i, (shape, want) in enumerate(zip(shapes, expected), 1):
+            changed = [f for f, a, b in zip(fields, shape, want) if a != b]
+            if changed:
+                return False, f"slide {n} shape {i}: {', '.join(changed)} changed"
+    shapes = sum(len(s) for s in current['slides'])
+    return True, f"{len(current['slides'])} slides, {shapes} shapes identical"
+
+
+# --- cases (run in the child process) ------------------------------------------
+
+def _timed_runs(repeat, run):
+    """Per stage, fastest ms and fastest ms-per-calibration-ms over `repeat` calls of run()
+
+    Each run is divided by the faster of the calibrations timed just before
+    and just after it, so a machine that is slower (or busier) for a while
+    slows both alike. Returns (ms, relative, calibration ms, nested stage names).
+    """
+    from timing import record
+
+    samples, calibration, nested = [], [calibrate()], set()
+    for _ in range(repeat):
+        with record() as timer:
+            run()
+        calibration.append(calibrate())
+        samples.append((timer.totals, min(calibration[-2:])))
+        nested |= timer.nested
+    names = samples[0][0]
+    ms = {name: min(totals.get(name, 0.0) * 1000 for totals, _ in samples) for name in names}
+    relative = {name: min(totals.get(name, 0.0) * 1000 / cal for totals, cal in samples) for name in names}
+    return ms, relative, statistics.median(cal for _, cal in samples), sorted(nested)
+
+
+def check_image(path, name, fonts, update, baseline_fonts):
+    golden = os.path.join(GOLDEN_DIR, name)
+    if update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(path, 'rb') as src, open(golden, 'wb') as dst:
+            dst.write(src.read())
+        return {'status': 'updated', 'detail': os.path.relpath(golden)}
+    if not os.path.exists(golden):
+        return {'status': 'missing', 'detail': f"no golden {name} (run with --update)"}
+    if baseline_fonts is not None and fonts != baseline_fonts:
+        return {'status': 'skipped', 'detail': f"fonts differ from golden ({', '.join(baseline_fonts)})"}
+    identical, detail = image_diff(path, golden)
+    return {'status': 'ok' if identical else 'changed', 'detail': detail}
+
+
+def case_cover(tmp, repeat, update, baseline_fonts):
+    import create_linkedin_cover as cover
+
+    path = os.path.join(tmp, 'cover.png')
+
+    def run():
+        cover.render_background.cache_clear()
+        cover.save_cover({}, path)
+
+    stages = _timed_runs(repeat, run)
+    fonts = [os.path.basename(p) for p in cover.font_files()]
+    return stages, fonts, check_image(path, 'linkedin-cover.png', fonts, update, baseline_fonts)
+
+
+def case_og(tmp, repeat, update, baseline_fonts):
+    import create_og_image as og
+
+    stem = os.path.join(tmp, 'og')
+
+    def run():
+        og.render_background.cache_clear()
+        og.save_og({}, stem, scales=(1, 2))
+
+    stages = _timed_runs(repeat, run)
+    fonts = [os.path.basename(p) for p in og.font_files()]
+    return stages, fonts, check_image(f'{stem}.png', 'og-image.png', fonts, update, baseline_fonts)
+
+
+def case_deck(tmp, repeat, update, baseline_fonts):
+    from pptx import Presentation
+
+    import shutil
+
+    import deck_images
+    from create_pptx import DEFAULT_SPEC
+    from deck_engine import build_deck
+    from spec_files import load_spec
+    from timing import stage
+
+    spec = load_spec(DEFAULT_SPEC)
+    path = os.path.join(tmp, 'deck.pptx')
+    image_cache = os.path.join(tmp, 'images')
+
+    def run():
+        # A cold library every run, so the images stage is measured each time
+        shutil.rmtree(image_cache, ignore_errors=True)
+        deck_images._library = deck_images.ImageLibrary(image_cache)
+        prs = build_deck(spec)
+        with stage('save'):
+            prs.save(path)
+
+    stages = _timed_runs(repeat, run)
+    structure = deck_structure(Presentation(path))
+    golden = os.path.join(GOLDEN_DIR, 'deloitte_deck.json')
+    if update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(golden, 'w') as f:
+            json.dump(structure, f, indent=1)
+            f.write('\n')
+        check = {'status': 'updated', 'detail': os.path.relpath(golden)}
+    elif not os.path.exists(golden):
+        check = {'status': 'missing', 'detail': "no golden deloitte_deck.json (run with --update)"}
+    else:
+        with open(golden) as f:
+            identical, detail = structure_diff(structure, json.load(f))
+        check = {'status': 'ok' if identical else 'changed', 'detail': detail}
+    return stages, [], check
+
+
+def run_child(case, repeat, update, baseline_fonts):
+    """Child process: run one case and print its results as JSON"""
+    import logging
+    logging.disable(logging.INFO)   # keep font-selection logs out of the JSON on stdout
+    runner = {'cover': case_cover, 'og': case_og, 'deck': case_deck}[case]
+    with tempfile.TemporaryDirectory() as tmp:
+        (stages, relative, calibration_ms, nested), fonts, check = runner(tmp, repeat, update, baseline_fonts)
+    print(json.dumps({
+        'stages': stages,
+        'relative': relative,
+        'nested': nested,
+        'calibration_ms': calibration_ms,
+        'peak_rss_mb': peak_rss_mb(),
+        'fonts': fonts,
+        'check': check,
+    }))
+
+
+# --- driver --------------------------------------------------------------------
+
+def measure(case, repeat, update, baseline_fonts):
+    cmd = [sys.executable, __file__, '--child', case, '--repeat', str(repeat)]
+    if update:
+        cmd.append('--update')
+    if baseline_fonts is not None:
+        cmd += ['--fonts', json.dumps(baseline_fonts)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=TOOLS_DIR).stdout
+    return json.loads(out)
+
+
+def machine():
+    return f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+
+
+def top_level_total(stages, nested):
+    return sum(value for name, value in stages.items() if name not in nested)
+
+
+def compare(case, result, base, threshold):
+    """Print one case's table rows; returns the number of regressions
+
+    Times are gated on their ratio to the calibration workload; the ms
+    columns are information.
+    """
+    failures = 0
+    calibrated = base is not None and 'relative' in base
+    cal, nested = result['calibration_ms'], result['nested']
+    rows = [(name, result['stages'][name], result['relative'][name],
+             base['stages'].get(name) if base else None, base['relative'].get(name) if calibrated else None)
+            for name in result['stages']]
+    rows.append(('total', top_level_total(result['stages'], nested), top_level_total(result['relative'], nested),
+                 top_level_total(base['stages'], base.get('nested', ())) if base else None,
+                 top_level_total(base['relative'], base.get('nested', ())) if calibrated else None))
+
+    shown = f"{base['calibration_ms']:.1f}ms" if calibrated else '-'
+    change = f"{cal / base['calibration_ms'] - 1:+.0%}" if calibrated else ''
+    print(f"{case:>6}  {'calibration':>12}  {shown:>10}  {cal:>8.1f}ms  {change:>6}  info")
+    for name, value, relative, expected, expected_relative in rows:
+        shown = f"{expected:.1f}ms" if expected is not None else '-'
+        if expected is None:
+            status, change = 'new', ''
+        elif expected_relative is None:
+            status, change = 'no calibration (run --update)', ''
+        else:
+            change = f"{relative / expected_relative - 1:+.0%}" if expected_relative else ''
+            slower = relative > expected_relative * (1 + threshold) + NOISE_MS / cal
+            status = 'REGRESSED' if slower else 'ok'
+            failures += slower
+        print(f"{case:>6}  {name:>12}  {shown:>10}  {value:>8.1f}ms  {change:>6}  {status}")
+
+    # Memory doesn't depend on machine speed: compared as is
+    value = result['peak_rss_mb']
+    if base is None:
+        print(f"{case:>6}  {'peak RSS':>12}  {'-':>10}  {value:>8.1f}MB  {'':>6}  new")
+    else:
+        expected = base['peak_rss_mb']
+        grown = value > expected * (1 + threshold)
+        failures += grown
+        print(f"{case:>6}  {'peak RSS':>12}  {expected:>8.1f}MB  {value:>8.1f}MB  "
+              f"{(value - expected) / expected:>+6.0%}  {'REGRESSED' if grown else 'ok'}")
+    check = result['check']
+    print(f"{case:>6}  {'output':>12}  {check['status']}: {check['detail']}")
+    return failures + (check['status'] in ('changed', 'missing'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', default=','.join(CASES), help='comma-separated cases')
+    parser.add_argument('--repeat', type=int, default=7, help='runs per case (the fastest is reported)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed slowdown (plus NOISE_MS) / memory growth as a fraction of the baseline')
+    parser.add_argument('--update', action='store_true', help='store these results as the new baselines and goldens')
+    parser.add_argument('--child', choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument('--fonts', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat, args.update, json.loads(args.fonts) if args.fonts else None)
+        return
+    if args.repeat < MIN_REPEAT:
+        if not args.update:
+            parser.error(f"--repeat must be at least {MIN_REPEAT} to gate on timings")
+        print(f"Warning: baselines from fewer than {MIN_REPEAT} runs per case are noisy")
+
+    try:
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {'machine': None, 'cases': {}}
+    if baseline['machine'] and baseline['machine'] != machine() and not args.update:
+        print(f"Note: baselines are from {baseline['machine']}; this is {machine()}")
+
+    print(f"{'case':>6}  {'stage':>12}  {'baseline':>10}  {'current':>10}  {'change':>6}  status")
+    failures = 0
+    for case in args.only.split(','):
+        base = baseline['cases'].get(case)
+        result = measure(case, args.repeat, args.update, base.get('fonts') if base else None)
+        failures += compare(case, result, None if args.update else base, args.threshold)
+        if args.update:
+            baseline['cases'][case] = {k: result[k] for k in
+                                       ('stages', 'relative', 'nested', 'calibration_ms', 'peak_rss_mb', 'fonts')}
+
+    if args.update:
+        baseline['machine'] = machine()
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        with open(BASELINE, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        print(f"Baselines written to {os.path.relpath(BASELINE)}")
+    elif failures:
+        print(f"{failures} regression(s)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Load test for share_service.py: latency percentiles and throughput under concurrent requests.
+
+Usage: python tools/bench_share_service.py [--url http://127.0.0.1:8040] [--concurrency 32]
+                                           [--requests 2000] [--unique 100] [--format png] [--processes]
+
+Without --url a service is started on a free port for the run (--workers
+and --processes are passed to it). Each of --concurrency clients keeps one
+keep-alive connection and requests cards personalized for --unique
+recipients in shuffled order, so the run mixes fresh renders, requests
+that join a render already in flight and cache hits. Reports
+client-side p50/p90/p99 per outcome, throughput, and the service's own
+/metrics (render time, queue wait, max queue depth).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from share_service import percentiles
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+VARIANTS = ('og-image', 'og-deloitte', 'og-kpmg', 'og-lastmile')
+
+
+def card_paths(unique, fmt):
+    """One personalized card URL path per recipient"""
+    paths = []
+    for n in range(unique):
+        query = urlencode({'variant': VARIANTS[n % len(VARIANTS)], 'eyebrow': f"Prepared for Recipient {n}"})
+        paths.append(f'/card.{fmt}?{query}')
+    return paths
+
+
+async def fetch(reader, writer, host, path):
+    """GET over a keep-alive connection; returns (status, headers, body)"""
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+async def client(host, port, queue, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            status, headers, body = await fetch(reader, writer, host, path)
+            outcome = headers.get('x-cache', str(status)) if status == 200 else str(status)
+            results.append((outcome, (time.perf_counter() - start) * 1000, len(body)))
+    finally:
+        writer.close()
+
+
+async def load(host, port, paths, concurrency):
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, queue, results) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    _, _, body = await fetch(reader, writer, host, '/metrics')
+    writer.close()
+    return results, elapsed, json.loads(body)
+
+
+def start_service(workers, processes):
+    """Start share_service.py on a free port; returns (process, port)"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    cmd = [sys.executable, os.path.join(TOOLS_DIR, 'share_service.py'), '--port', str(port)]
+    if workers:
+        cmd += ['--workers', str(workers)]
+    if processes:
+        cmd.append('--processes')
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    print(proc.stdout.readline().strip())   # the service prints one line once it is listening
+    return proc, port
+
+
+def report(results, elapsed, metrics):
+    row = lambda name, p: (f"{name:<10}  {p['count']:>6}  {p['p50']:>8.1f}  {p['p90']:>8.1f}  "
+                           f"{p['p99']:>8.1f}  {p['max']:>8.1f}")
+    print(f"{'outcome':<10}  {'count':>6}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+    by_outcome = defaultdict(list)
+    for outcome, ms, _ in results:
+        by_outcome[outcome].append(ms)
+    for outcome in sorted(by_outcome):
+        print(row(outcome, percentiles(by_outcome[outcome])))
+    print(row('all', percentiles([ms for _, ms, _ in results])))
+    total_bytes = sum(size for _, _, size in results)
+    print(f"throughput  {len(results) / elapsed:.1f} req/s  ({len(results)} requests in {elapsed:.2f}s, "
+          f"{total_bytes / elapsed / 1024 / 1024:.1f} MB/s)")
+
+    print(f"service     {metrics['pool']['workers']} {metrics['pool']['kind']} workers; "
+          f"requests {', '.join(f'{k} {v}' for k, v in metrics['requests'].items() if v)}")
+    for name in ('render_ms', 'queue_wait_ms'):
+        p = metrics[name]
+        if p['count']:
+            print(f"            {name:<14} p50 {p['p50']:.1f}  p99 {p['p99']:.1f}  ({p['count']} renders)")
+    print(f"            max queue depth {metrics['max_queue_depth']}, "
+          f"cache {metrics['cache']['entries']} cards / {metrics['cache']['bytes'] / 1024 / 1024:.1f}MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the share card service")
+    parser.add_argument('--url', help='running service (default: start one for the run)')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent keep-alive clients')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--unique', type=int, default=100, help='distinct personalized cards')
+    parser.add_argument('--format', choices=('png', 'webp'), default='png')
+    parser.add_argument('--workers', type=int, help='service render pool size (started service only)')
+    parser.add_argument('--processes', action='store_true', help='process pool (started service only)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        proc, port = start_service(args.workers, args.processes)
+        host = '127.0.0.1'
+    try:
+        unique = card_paths(args.unique, args.format)
+        paths = [unique[i % len(unique)] for i in range(args.requests)]
+        random.Random(args.seed).shuffle(paths)
+        results, elapsed, metrics = asyncio.run(load(host, port, paths, args.concurrency))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    failed = Counter(o for o, _, _ in results if o.isdigit())
+    if failed:
+        print(f"non-200 responses: {dict(failed)}")
+    report(results, elapsed, metrics)
+
+
+if __name__ == '__main__':
+    main()
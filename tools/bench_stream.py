@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Peak RSS and wall time of in-memory vs streaming deck generation.
+
+Usage: python tools/bench_stream.py [--counts 10,100,1000]
+
+Each deck cycles through the Deloitte slides and puts a team photo on
+every slide. Every measurement runs in a fresh subprocess so peak RSS
+(ru_maxrss) is per run.
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+PHOTOS = sorted(glob.glob(os.path.join(REPO_ROOT, 'assets', 'images', 'team', '*.jpeg')))
+
+
+def run_once(mode, count, path):
+    """Child process: build a `count`-slide deck and print timing/RSS as JSON"""
+    from pptx.util import Inches
+
+    from deck_engine import build_deck
+    from pptx_stream import StreamingDeckWriter
+    from spec_files import load_spec
+
+    base = load_spec(os.path.join(TOOLS_DIR, 'specs', 'deloitte_deck.json'))
+    spec = {**base, 'slides': list(itertools.islice(itertools.cycle(base['slides']), count))}
+    photos = itertools.cycle(PHOTOS)
+
+    def add_photo(slide):
+        slide.shapes.add_picture(next(photos), Inches(12), Inches(6.5), Inches(1), Inches(1))
+
+    start = time.perf_counter()
+    if mode == 'stream':
+        with StreamingDeckWriter(path) as writer:
+            def after_slide(slide):
+                add_photo(slide)
+                writer.flush()
+            build_deck(spec, writer.prs, after_slide=after_slide)
+    else:
+        build_deck(spec, after_slide=add_photo).save(path)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+    print(json.dumps({'seconds': elapsed, 'rss_mb': rss_mb, 'bytes': os.path.getsize(path)}))
+
+
+def measure(mode, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        out = subprocess.run(
+            [sys.executable, __file__, '--child', mode, str(count), os.path.join(tmp, 'deck.pptx')],
+            check=True, capture_output=True, text=True, cwd=TOOLS_DIR,
+        ).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', default='10,100,1000', help='comma-separated slide counts')
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'COUNT', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, count, path = args.child
+        run_once(mode, int(count), path)
+        return
+
+    print(f"{'slides':>6}  {'mode':>6}  {'wall':>8}  {'peak RSS':>9}  {'size':>8}")
+    for count in (int(c) for c in args.counts.split(',')):
+        for mode in ('memory', 'stream'):
+            r = measure(mode, count)
+            print(f"{count:>6}  {mode:>6}  {r['seconds']:>7.2f}s  {r['rss_mb']:>7.1f}MB  "
+                  f"{r['bytes'] / 1024:>6.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
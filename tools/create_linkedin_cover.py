@@ -1,112 +1,181 @@
 #!/usr/bin/env python3
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
+from functools import lru_cache
+import argparse
+import logging
 import os
 
+from drawing import draw_grid, draw_pills, draw_text_lines, gradient_bar
+from fonts import get_font, registry
+from glow import draw_glows
+from gradients import diagonal_gradient
+from timing import instrument, stage, summary_table
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+
+# Everything a rendered cover depends on besides its spec (for the render cache)
+SOURCES = [os.path.join(TOOLS_DIR, name)
+           for name in ('create_linkedin_cover.py', 'drawing.py', 'fonts.py', 'glow.py', 'gradients.py')]
+
 # LinkedIn cover dimensions
 WIDTH = 1584
 HEIGHT = 396
 
-# Create image with dark gradient background
-img = Image.new('RGB', (WIDTH, HEIGHT), '#0f172a')
-draw = ImageDraw.Draw(img)
-
-# Create gradient background effect
-for x in range(WIDTH):
-    for y in range(HEIGHT):
-        # Create a subtle diagonal gradient
-        factor = (x / WIDTH + y / HEIGHT) / 2
-        r = int(15 + factor * 15)
-        g = int(23 + factor * 18)
-        b = int(42 + factor * 17)
-        draw.point((x, y), fill=(r, g, b))
-
-# Add subtle grid pattern
-grid_color = (255, 255, 255, 8)
-for x in range(0, WIDTH, 60):
-    draw.line([(x, 0), (x, HEIGHT)], fill=(30, 41, 59), width=1)
-for y in range(0, HEIGHT, 60):
-    draw.line([(0, y), (WIDTH, y)], fill=(30, 41, 59), width=1)
-
-# Add glowing circles (decorative)
-def draw_glow_circle(draw, cx, cy, r, color, alpha):
-    for i in range(r, 0, -2):
-        a = int(alpha * (i / r))
-        c = (*color, a)
-        # Since we can't use alpha directly, we'll simulate with color blending
-        pass
-
-# Add decorative elements (subtle colored areas)
-draw.ellipse([(-50, -100), (250, 200)], fill=(20, 30, 50), outline=None)
-draw.ellipse([(1350, 250), (1650, 500)], fill=(25, 28, 52), outline=None)
-
-# Try to load a system font, fall back to default
-try:
-    font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
-    font_medium = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 20)
-    font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 16)
-except:
-    try:
-        font_large = ImageFont.truetype("/System/Library/Fonts/SFNSDisplay.ttf", 48)
-        font_medium = ImageFont.truetype("/System/Library/Fonts/SFNSDisplay.ttf", 20)
-        font_small = ImageFont.truetype("/System/Library/Fonts/SFNSDisplay.ttf", 16)
-    except:
-        font_large = ImageFont.load_default()
-        font_medium = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-
-# Main text - positioned to avoid logo area (left ~200px is logo zone)
-# "Bridge the Enterprise"
-draw.text((450, 100), "Bridge the Enterprise", fill='#ffffff', font=font_large)
-
-# "AI Skills Gap" with gradient effect (approximate with blue-purple)
-draw.text((450, 160), "AI Skills Gap", fill='#818cf8', font=font_large)
-
-# Subheadline
-draw.text((450, 235), "From pilots to production. Training that delivers ROI.", fill='#94a3b8', font=font_medium)
-
-# Accent line (gradient bar)
-for x in range(450, 650):
-    progress = (x - 450) / 200
-    r = int(59 + progress * (139 - 59))
-    g = int(130 + progress * (92 - 130))
-    b = int(246 + progress * (246 - 246))
-    draw.line([(x, 280), (x, 284)], fill=(r, g, b), width=1)
-
-# Feature pills on right side
-pills = [
-    ("Live Builds", (59, 130, 246), 90),
-    ("Your Tools", (139, 92, 246), 145),
-    ("Measurable ROI", (16, 185, 129), 200)
-]
-
-for text, color, y_offset in pills:
-    # Pill background
-    pill_x = 1100
-    pill_y = y_offset
-    pill_width = 160
-    pill_height = 32
-
-    # Draw rounded rectangle (pill shape)
-    bg_color = (color[0]//4, color[1]//4, color[2]//4)
-    draw.rounded_rectangle(
-        [(pill_x, pill_y), (pill_x + pill_width, pill_y + pill_height)],
-        radius=16,
-        fill=bg_color
-    )
-
-    # Pill text
-    text_color = (color[0] + 60, min(color[1] + 60, 255), min(color[2] + 60, 255))
-    bbox = draw.textbbox((0, 0), text, font=font_small)
-    text_width = bbox[2] - bbox[0]
-    text_x = pill_x + (pill_width - text_width) // 2
-    text_y = pill_y + 7
-    draw.text((text_x, text_y), text, fill=text_color, font=font_small)
-
-# Website URL
-draw.text((1420, 355), "workflowy.ai", fill='#64748b', font=font_small)
-
-# Save
-output_path = '/Users/nadimnasser/GitHub/workflowy/linkedin-cover-1584x396.png'
-img.save(output_path, 'PNG', quality=95)
-print(f"Created: {output_path}")
-print(f"Size: {img.size}")
+# Layout presets per platform; a cover spec is one of these plus its content.
+# OG share images have their own layouts in create_og_image.py.
+PLATFORMS = {
+    'linkedin': {
+        'width': WIDTH,
+        'height': HEIGHT,
+        # Main text - positioned to avoid logo area (left ~200px is logo zone)
+        'text_x': 450,
+        'headline_y': 100,
+        'headline_gap': 60,
+        'subheadline_y': 235,
+        'accent_y': 280,
+        'pill_x': 1100,
+        'pill_y': 90,
+        'pill_gap': 55,
+        'url_xy': (1420, 355),
+        'font_sizes': (48, 20, 16),
+        'glows': [
+            (100, 50, 260, (59, 130, 246), 31, 0.7),
+            (1500, 375, 240, (139, 92, 246), 20, 0.7),
+        ],
+    },
+}
+
+DEFAULT_SPEC = {
+    'platform': 'linkedin',
+    'headline': ["Bridge the Enterprise", "AI Skills Gap"],
+    'subheadline': "From pilots to production. Training that delivers ROI.",
+    'pills': [
+        ("Live Builds", (59, 130, 246)),
+        ("Your Tools", (139, 92, 246)),
+        ("Measurable ROI", (16, 185, 129)),
+    ],
+    'url': "workflowy.ai",
+}
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'assets', 'images', 'social', 'linkedin-cover-1584x396.png')
+
+
+def resolve_spec(spec):
+    """Merge a cover spec over its platform preset and the default content"""
+    platform = spec.get('platform', DEFAULT_SPEC['platform'])
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown cover platform {platform!r} (OG images are made by create_og_image.py)")
+    return {**PLATFORMS[platform], **DEFAULT_SPEC, **spec}
+
+
+def background_key(spec):
+    """Hashable key of everything the background depends on"""
+    glows = tuple((x, y, r, tuple(color), a, fade) for x, y, r, color, a, fade in spec['glows'])
+    return (spec['width'], spec['height'], glows)
+
+
+@lru_cache(maxsize=16)
+def render_background(key):
+    """Gradient, grid and glows; cached so variants sharing a background render it once"""
+    width, height, glows = key
+
+    # Create image with dark gradient background
+    # (subtle diagonal gradient, computed in one pass instead of per-pixel)
+    with stage('background'):
+        img = diagonal_gradient((width, height), (15, 23, 42), (30, 41, 59)).convert('RGBA')
+
+    with stage('decorations'):
+        draw = ImageDraw.Draw(img)
+
+        # Add subtle grid pattern
+        draw_grid(draw, (width, height), 60, (30, 41, 59))
+
+        # Add glowing circles (decorative), matching the radial glows in og-image-template.html
+        draw_glows(img, glows)
+    return img
+
+
+def load_fonts(sizes):
+    """Large/medium/small fonts from the shared font registry"""
+    return tuple(get_font('sans', 'regular', size) for size in sizes)
+
+
+def font_files():
+    """Font files the cover renders with (for the render cache key)"""
+    face = registry().face('sans', 'regular')
+    return [face[0]] if face else []
+
+
+def render_cover(spec=None):
+    """Render a cover spec (see DEFAULT_SPEC / PLATFORMS) to an RGB image"""
+    spec = resolve_spec(spec or {})
+    img = render_background(background_key(spec)).copy()
+    draw = ImageDraw.Draw(img)
+    font_large, font_medium, font_small = load_fonts(tuple(spec['font_sizes']))
+    x = spec['text_x']
+
+    with stage('text'):
+        # Headline: first line white, the rest in the blue-purple accent
+        headline = spec['headline']
+        fills = ['#ffffff'] + ['#818cf8'] * (len(headline) - 1)
+        draw_text_lines(draw, (x, spec['headline_y']), headline, font_large, fills, spec['headline_gap'])
+
+        # Subheadline
+        draw.text((x, spec['subheadline_y']), spec['subheadline'], fill='#94a3b8', font=font_medium)
+
+    with stage('decorations'):
+        # Accent line (gradient bar)
+        accent_y = spec['accent_y']
+        gradient_bar(img, (x, accent_y, x + 200, accent_y + 5), (59, 130, 246), (139, 92, 246))
+
+        # Feature pills
+        draw_pills(draw, spec['pills'], font_small, (spec['pill_x'], spec['pill_y']),
+                   (spec.get('pill_step_x', 0), spec['pill_gap']))
+
+    with stage('text'):
+        # Website URL
+        draw.text(tuple(spec['url_xy']), spec['url'], fill='#64748b', font=font_small)
+
+    return img.convert('RGB')
+
+
+def save_cover(spec, output_path, cache=None):
+    """Render a spec to output_path unless the render cache has it; returns True on a cache hit"""
+    if cache is not None:
+        key = cache.key(resolve_spec(spec), code=SOURCES, fonts=font_files())
+        if cache.fetch(key, output_path):
+            return True
+    img = render_cover(spec)
+    with stage('encode'):
+        img.save(output_path, 'PNG', quality=95)
+    if cache is not None:
+        cache.store(key, output_path)
+    return False
+
+
+def main(argv=None):
+    from render_cache import RenderCache
+
+    parser = argparse.ArgumentParser(description="Render the LinkedIn cover image")
+    parser.add_argument('output', nargs='?', default=DEFAULT_OUTPUT)
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help='write PREFIX.prof (cProfile) and PREFIX.collapsed (flamegraph stacks); skips the cache')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    cache = None if args.profile else RenderCache()
+    with instrument(args.profile) as timer:
+        save_cover({}, args.output, cache)
+    print(f"Created: {args.output}")
+    if timer.totals:
+        print(summary_table(timer, [('output', f"{os.path.getsize(args.output):,} bytes")]))
+    if args.profile:
+        print(f"Profile: {args.profile}.prof, {args.profile}.collapsed")
+    if cache:
+        cache.evict()
+        print(cache.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Render Open Graph share images (1200x630) natively, without a browser.
+
+Reproduces the HTML templates in tools/ with Pillow and NumPy:
+
+- 'workflowy': og-image-template.html (og-image-v4/v5)
+- 'client':    og-deloitte-template.html, co-branded with any partner
+- 'lastmile':  og-source.html
+
+Each image is rendered once at the largest requested scale and
+downsampled for the smaller ones, so 1x and 2x come from one pass.
+
+Usage: python tools/create_og_image.py [tools/specs/og_images.json] [--out DIR] [--scales 1,2] [--only NAME ...]
+
+A spec is a template name plus content:
+
+    {"name": "og-kpmg", "template": "client",
+     "partner": {"name": "KPMG", "color": [0, 51, 141]},
+     "eyebrow": "Executive AI Enablement",
+     "headline": [["Enable Your ", "Existing Tools"]],
+     "subheadline": "...", "tags": ["Use", "Direct"], "url": "workflowy.ai/kpmg"}
+
+Headline lines are strings, or lists whose odd-indexed items are highlighted.
+"""
+import argparse
+import logging
+import os
+import time
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+from drawing import (draw_grid, draw_tags, draw_tracked_text, drop_shadow, gradient_text,
+                     rounded_gradient, text_length, text_offset, wrap_text)
+from fonts import get_font, registry
+from glow import draw_glows
+from gradients import linear_gradient
+from spec_files import load_spec
+from timing import instrument, stage, summary_table
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+DEFAULT_SPEC = os.path.join(TOOLS_DIR, 'specs', 'og_images.json')
+
+# Everything a rendered image depends on besides its spec (for the render cache)
+SOURCES = [os.path.join(TOOLS_DIR, name)
+           for name in ('create_og_image.py', 'drawing.py', 'fonts.py', 'glow.py', 'gradients.py')]
+
+WIDTH = 1200
+HEIGHT = 630
+
+BLUE_PURPLE = [(0, (59, 130, 246)), (1, (139, 92, 246))]
+BRAND_TILE = [(0, (168, 85, 247)), (0.5, (139, 92, 246)), (1, (99, 102, 241))]
+
+# The "W" wave in the logo tile: SVG polyline in a 40x40 viewBox drawn at 36px
+LOGO_WAVE = [(8, 14), (12, 28), (16, 20), (20, 28), (24, 20), (28, 28), (32, 14)]
+
+# Layout presets in 1x pixels, taken from each template's CSS
+TEMPLATES = {
+    'workflowy': {
+        'background': ((15, 23, 42), (30, 41, 59)),
+        # (cx, cy, radius, color, alpha, fade); color 'partner' uses the partner's color
+        'glows': [
+            (1050, 150, 300, (59, 130, 246), 31, 0.7),
+            (100, 580, 250, (139, 92, 246), 20, 0.7),
+        ],
+        'circles': [],
+        'grid': (50, (59, 130, 246, 8)),
+        'padding': (70, 60),
+        'layout': 'spread',
+        'logo': {'size': 56, 'radius': 14, 'stops': BRAND_TILE, 'mark': 'wave', 'gap': 16,
+                 'shadow': (0, 8, 32, (139, 92, 246), 77), 'wordmark': (32, 'bold')},
+        'eyebrow_style': (15, 3, 20),                   # size, letter-spacing, margin below
+        'headline_style': (64, 'extrabold', 1.1, 24),   # size, weight, line-height, margin below
+        'highlight': BLUE_PURPLE,
+        'subheadline_style': (24, 750),                 # size, max width
+        'tag_style': (14, (20, 10), 12, 24, 64),        # size, padding, gap, radius, border alpha
+        'url_style': (20, 'semibold'),
+    },
+    'client': {
+        'background': ((15, 23, 42), (30, 41, 59)),
+        'glows': [
+            (1050, 150, 250, (59, 130, 246), 38, 0.7),
+            (100, 580, 200, 'partner', 26, 0.7),
+        ],
+        'circles': [],
+        'grid': (40, (59, 130, 246, 8)),
+        'padding': (60, 50),
+        'layout': 'spread',
+        'logo': {'size': 48, 'radius': 12, 'stops': BLUE_PURPLE, 'mark': 'letter', 'gap': 12,
+                 'shadow': None, 'wordmark': (24, 'bold')},
+        'lockup': {'gap': 20, 'divider': (28, (71, 85, 105)), 'dot': 12, 'dot_gap': 10,
+                   'wordmark': (24, 'semibold')},
+        'eyebrow_style': (14, 3, 16),
+        'headline_style': (56, 'extrabold', 1.1, 20),
+        'highlight': [(0, (59, 130, 246))],
+        'subheadline_style': (22, 700),
+        'tag_style': (13, (16, 8), 12, 20, 77),
+        'url_style': (18, 'medium'),
+    },
+    'lastmile': {
+        'background': ((30, 41, 59), (15, 23, 42)),
+        'glows': [],
+        'circles': [                                    # (cx, cy, radius, color, alpha)
+            (1100, 100, 200, (59, 130, 246), 26),
+            (100, 530, 150, (139, 92, 246), 26),
+        ],
+        'grid': None,
+        'padding': (80, 80),
+        'layout': 'top',
+        'logo': None,
+        'eyebrow_style': (20, 3, 24),
+        'headline_style': (56, 'bold', 1.2, 32),
+        'highlight': BLUE_PURPLE,
+        'subheadline_style': (24, 800),
+        'accent': (120, 4, 2, 40),                      # width, height, radius, margin above
+        'bar': {'height': 70, 'color': (30, 41, 59), 'wordmark': (28, 'bold')},
+        'tag_style': None,
+        'url_style': (18, 'regular'),
+    },
+}
+
+DEFAULT_CONTENT = {
+    'template': 'workflowy',
+    'brand': "Workflowy",
+    'partner': None,
+    'eyebrow': "Enterprise AI Enablement",
+    'headline': ["From AI Experimentation", ["to ", "AI Execution"]],
+    'subheadline': "We help teams build real AI capability with structured programs "
+                   "that deliver measurable results.",
+    'tags': ["Strategy", "Training", "Implementation"],
+    'url': "workflowy.ai",
+}
+
+
+def resolve_spec(spec):
+    """Merge an OG spec over its template preset and the default content"""
+    template = spec.get('template', DEFAULT_CONTENT['template'])
+    resolved = {**TEMPLATES[template], **DEFAULT_CONTENT, **spec}
+    if not resolved['brand'].strip():
+        raise ValueError("brand must not be empty (the wordmark and letter logo are drawn from it)")
+    return resolved
+
+
+def background_key(spec, scale):
+    """Hashable key of everything the background depends on, in scaled pixels"""
+    partner = tuple(spec['partner']['color']) if spec.get('partner') else (59, 130, 246)
+    glows = tuple(
+        (x * scale, y * scale, r * scale, partner if color == 'partner' else tuple(color), a, fade)
+        for x, y, r, color, a, fade in spec['glows'])
+    circles = tuple((x * scale, y * scale, r * scale, tuple(color), a) for x, y, r, color, a in spec['circles'])
+    grid = (spec['grid'][0] * scale, tuple(spec['grid'][1])) if spec.get('grid') else None
+    start, end = spec['background']
+    return (WIDTH * scale, HEIGHT * scale, tuple(start), tuple(end), glows, circles, grid, scale)
+
+
+@lru_cache(maxsize=16)
+def render_background(key):
+    """135deg gradient, glows, solid circles and grid as an RGB image"""
+    width, height, start, end, glows, circles, grid, scale = key
+    with stage('background'):
+        img = linear_gradient((width, height), start, end, angle=135).convert('RGBA')
+    with stage('decorations'):
+        draw_glows(img, glows)
+        img = img.convert('RGB')
+        draw = ImageDraw.Draw(img, 'RGBA')
+        for cx, cy, r, color, alpha in circles:
+            draw.ellipse([(cx - r, cy - r), (cx + r, cy + r)], fill=color + (alpha,))
+        if grid:
+            draw_grid(draw, (width, height), grid[0], grid[1], width=scale)
+    return img
+
+
+def font_files():
+    """Font files the OG images render with (for the render cache key)"""
+    faces = (registry().face('sans', weight)
+             for weight in ('regular', 'medium', 'semibold', 'bold', 'extrabold'))
+    return sorted({face[0] for face in faces if face})
+
+
+def _draw_logo(img, draw, spec, x, cy, s):
+    """Brand tile and wordmark (plus the partner lockup on 'client'), vertically centered on cy"""
+    logo = spec['logo']
+    size = round(logo['size'] * s)
+    top = round(cy - size / 2)
+    box = (x, top, x + size, top + size)
+    if logo['shadow']:
+        dx, dy, blur, color, alpha = logo['shadow']
+        drop_shadow(img, box, logo['radius'] * s, color, alpha, blur * s, (round(dx * s), round(dy * s)))
+    rounded_gradient(img, box, logo['stops'], round(logo['radius'] * s), angle=135)
+
+    if logo['mark'] == 'wave':
+        icon = size * 36 / 56
+        unit, inset = icon / 40, (size - icon) / 2
+        points = [(x + inset + px * unit, top + inset + py * unit) for px, py in LOGO_WAVE]
+        stroke = max(1, round(2.5 * unit))
+        draw.line(points, fill='#ffffff', width=stroke, joint='curve')
+        for px, py in (points[0], points[-1]):   # stroke-linecap: round
+            draw.ellipse([(px - stroke / 2, py - stroke / 2), (px + stroke / 2, py + stroke / 2)], fill='#ffffff')
+    else:
+        font = get_font('sans', 'extrabold', round(logo['size'] / 2 * s))
+        draw.text((x + size / 2, cy), spec['brand'][0], fill='#ffffff', font=font, anchor='mm')
+
+    x += size + logo['gap'] * s
+    font = get_font('sans', logo['wordmark'][1], round(logo['wordmark'][0] * s))
+    draw.text((x, cy), spec['brand'], fill='#ffffff', font=font, anchor='lm')
+    x += text_length(font, spec['brand'])
+
+    # Partner lockup: "× • Partner"
+    partner, style = spec.get('partner'), spec.get('lockup')
+    if not (partner and style):
+        return
+    gap = style['gap'] * s
+    divider = get_font('sans', 'regular', round(style['divider'][0] * s))
+    draw.text((x + gap, cy), '×', fill=style['divider'][1], font=divider, anchor='lm')
+    x += gap + text_length(divider, '×') + gap
+    r = style['dot'] * s / 2
+    draw.ellipse([(x, cy - r), (x + 2 * r, cy + r)], fill=tuple(partner['color']))
+    x += 2 * r + style['dot_gap'] * s
+    font = get_font('sans', style['wordmark'][1], round(style['wordmark'][0] * s))
+    draw.text((x, cy), partner['name'], fill='#ffffff', font=font, anchor='lm')
+
+
+def render_og(spec=None, scale=1):
+    """Render an OG spec (see DEFAULT_CONTENT / TEMPLATES) at `scale` to an RGB image"""
+    spec = resolve_spec(spec or {})
+    s = scale
+    img = render_background(background_key(spec, s)).copy()
+    draw = ImageDraw.Draw(img, 'RGBA')
+    width, height = img.size
+    pad_x, pad_y = spec['padding'][0] * s, spec['padding'][1] * s
+    x = round(pad_x)
+
+    # Content block: eyebrow, headline, wrapped subheadline
+    eyebrow_size, tracking, eyebrow_gap = spec['eyebrow_style']
+    head_size, head_weight, head_lh, head_gap = spec['headline_style']
+    sub_size, sub_width = spec['subheadline_style']
+    eyebrow_font = get_font('sans', 'semibold', round(eyebrow_size * s))
+    head_font = get_font('sans', head_weight, round(head_size * s))
+    sub_font = get_font('sans', 'regular', round(sub_size * s))
+    sub_lines = wrap_text(sub_font, spec['subheadline'], sub_width * s)
+    eyebrow_h = sum(eyebrow_font.getmetrics())
+    head_line = head_size * head_lh * s
+    sub_line = sub_size * 1.5 * s
+    content_h = (eyebrow_h + eyebrow_gap * s + len(spec['headline']) * head_line
+                 + head_gap * s + len(sub_lines) * sub_line)
+
+    # Footer row: tags on the left, url on the right
+    url_font = get_font('sans', spec['url_style'][1], round(spec['url_style'][0] * s))
+    if spec['tags'] and spec['tag_style']:
+        tag_size, tag_pad, tag_gap, tag_radius, tag_border = spec['tag_style']
+        tag_font = get_font('sans', 'medium', round(tag_size * s))
+        tag_line = sum(tag_font.getmetrics())
+        footer_h = max(tag_line + 2 * tag_pad[1] * s, sum(url_font.getmetrics()))
+    else:
+        footer_h = sum(url_font.getmetrics())
+
+    with stage('decorations'):
+        if spec['layout'] == 'spread':
+            # Header at the top, footer at the bottom, content centered between them
+            header_h = spec['logo']['size'] * s
+            footer_top = height - pad_y - footer_h
+            top = pad_y + header_h + (footer_top - pad_y - header_h - content_h) / 2
+            _draw_logo(img, draw, spec, x, pad_y + header_h / 2, s)
+            footer_cy = footer_top + footer_h / 2
+        else:
+            top = pad_y
+            bar = spec['bar']
+            bar_top = height - bar['height'] * s
+            draw.rectangle([(0, bar_top), (width, height)], fill=tuple(bar['color']))
+            footer_cy = bar_top + bar['height'] * s / 2
+            font = get_font('sans', bar['wordmark'][1], round(bar['wordmark'][0] * s))
+            ascent, descent = font.getmetrics()
+            gradient_text(img, (x, footer_cy - (ascent + descent) / 2), spec['brand'], font,
+                          spec['highlight'], angle=135)
+
+    with stage('text'):
+        # Eyebrow (uppercase, letter-spaced)
+        y = top
+        draw_tracked_text(draw, (x, y), spec['eyebrow'].upper(), eyebrow_font, '#3b82f6', tracking * s)
+        y += eyebrow_h + eyebrow_gap * s
+
+        # Headline: white, with highlighted segments gradient- or accent-filled
+        dy = text_offset(head_font, head_line)
+        for line in spec['headline']:
+            segments = [line] if isinstance(line, str) else line
+            seg_x = x
+            for i, segment in enumerate(segments):
+                if i % 2:
+                    seg_x = gradient_text(img, (seg_x, y + dy), segment, head_font, spec['highlight'], angle=135)
+                else:
+                    draw.text((seg_x, y + dy), segment, fill='#ffffff', font=head_font)
+                    seg_x += text_length(head_font, segment)
+            y += head_line
+        y += head_gap * s
+
+        # Subheadline
+        dy = text_offset(sub_font, sub_line)
+        for line in sub_lines:
+            draw.text((x, y + dy), line, fill='#94a3b8', font=sub_font)
+            y += sub_line
+
+    with stage('decorations'):
+        if spec.get('accent'):
+            bar_w, bar_h, radius, margin = spec['accent']
+            y += margin * s
+            rounded_gradient(img, (x, round(y), x + round(bar_w * s), round(y + bar_h * s)),
+                             spec['highlight'], round(radius * s), angle=135)
+
+        if spec['tags'] and spec['tag_style']:
+            tag_h = tag_line + 2 * tag_pad[1] * s
+            draw_tags(draw, spec['tags'], tag_font, (x, footer_cy - tag_h / 2),
+                      (tag_pad[0] * s, tag_pad[1] * s), tag_gap * s, tag_line, round(tag_radius * s),
+                      fill=(59, 130, 246, 26), outline=(59, 130, 246, tag_border), text_fill='#93c5fd',
+                      outline_width=s)
+
+    with stage('text'):
+        draw.text((width - pad_x, footer_cy), spec['url'], fill='#64748b', font=url_font, anchor='rm')
+    return img
+
+
+def output_paths(stem, scales):
+    """{scale: path} for an output stem: name.png for 1x, name@2x.png for 2x, ..."""
+    return {scale: f'{stem}.png' if scale == 1 else f'{stem}@{scale}x.png' for scale in scales}
+
+
+def save_og(spec, stem, scales=(1, 2), cache=None):
+    """Render a spec once at the largest scale and save every scale; returns (paths, cache_hit)"""
+    paths = output_paths(stem, scales)
+    top = max(scales)
+    if cache is not None:
+        resolved = resolve_spec(spec)
+        # Smaller scales are reduced from the `top` render, which differs from rendering them directly
+        keys = {scale: cache.key({**resolved, 'scale': scale, 'rendered_at': top}, code=SOURCES,
+                                 fonts=font_files())
+                for scale in scales}
+        if all(cache.fetch(keys[scale], path) for scale, path in paths.items()):
+            return paths, True
+    img = render_og(spec, top)
+    for scale, path in paths.items():
+        with stage('scale'):
+            if scale == top:
+                out = img
+            elif top % scale == 0:
+                out = img.reduce(top // scale)   # box filter; exact for integer ratios and much faster
+            else:
+                out = img.resize((WIDTH * scale, HEIGHT * scale), Image.LANCZOS)
+        with stage('encode'):
+            out.save(path, 'PNG')
+        if cache is not None:
+            cache.store(keys[scale], path)
+    return paths, False
+
+
+def main(argv=None):
+    from render_cache import RenderCache
+    from render_covers import expand_variants
+
+    parser = argparse.ArgumentParser(description="Render OG share images from a spec file")
+    parser.add_argument('spec', nargs='?', default=DEFAULT_SPEC, help='JSON or YAML spec file')
+    parser.add_argument('--out', help='output directory (overrides the spec)')
+    parser.add_argument('--scales', default='1,2', help='comma-separated pixel densities')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='render just these variants')
+    parser.add_argument('--no-cache', action='store_true', help='always re-render')
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help='write PREFIX.prof (cProfile) and PREFIX.collapsed (flamegraph stacks); skips the cache')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    spec = load_spec(args.spec)
+    output_dir = args.out or os.path.normpath(os.path.join(
+        os.path.dirname(os.path.abspath(args.spec)), spec.get('output_dir', 'build')))
+    os.makedirs(output_dir, exist_ok=True)
+    scales = sorted({int(s) for s in args.scales.split(',')})
+    cache = None if args.no_cache or args.profile else RenderCache()
+
+    written = []
+    with instrument(args.profile) as timer:
+        for variant in expand_variants(spec):
+            if args.only and variant['name'] not in args.only:
+                continue
+            start = time.perf_counter()
+            content = {k: v for k, v in variant.items() if k != 'name'}
+            paths, hit = save_og(content, os.path.join(output_dir, variant['name']), scales, cache)
+            written += paths.values()
+            print(f"  {(time.perf_counter() - start) * 1000:7.1f}ms  {'cached' if hit else 'render'}  "
+                  f"{', '.join(paths.values())}")
+    if timer.totals:
+        total = sum(os.path.getsize(path) for path in written)
+        print(summary_table(timer, [('output', f"{total:,} bytes in {len(written)} files")]))
+    if args.profile:
+        print(f"Profile: {args.profile}.prof, {args.profile}.collapsed")
+    if cache is not None:
+        cache.evict()
+        print(cache.summary())
+
+
+if __name__ == '__main__':
+    main()
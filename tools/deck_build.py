@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Incremental deck builds: only re-render slides whose inputs changed.
+
+Every slide gets a fingerprint: the SHA-256 of its resolved spec (deck
+parameters applied), the templates it uses, the images it shows, the
+slide size, the engine source and the python-pptx version. The rendered
+slide part (XML, rels and media) is kept in ``build/.slide-cache`` under
+that fingerprint, so a rebuild renders only slides with a new fingerprint
+and repackages the rest from the cache through the streaming writer.
+
+Watch mode polls the spec file and the images it shows and rebuilds when
+they change; an edit to the engine sources restarts it:
+
+    python tools/create_pptx.py --watch
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+
+import pptx
+
+from deck_engine import add_spec_slide, resolve_deck, setup_presentation
+from deck_images import image_files, library
+from pptx_stream import StreamingDeckWriter
+from render_cache import REPO_ROOT, file_digest, file_stamp
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, 'build', '.slide-cache')
+ENGINE_SOURCES = [os.path.join(TOOLS_DIR, name) for name in ('deck_engine.py', 'deck_images.py', 'pptx_stream.py')]
+
+# Snapshots kept on disk; least recently used beyond this are removed
+MAX_SNAPSHOTS = 5000
+
+
+def _templates_used(value, found):
+    """Names of the spec templates a slide references"""
+    if isinstance(value, dict):
+        if value.get('type') == 'grid' and isinstance(value.get('template'), str):
+            found.add(value['template'])
+        for v in value.values():
+            _templates_used(v, found)
+    elif isinstance(value, list):
+        for v in value:
+            _templates_used(v, found)
+    return found
+
+
+class IncrementalDeckBuilder:
+    """Builds decks reusing cached slide parts for unchanged slides"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _engine_digest(self):
+        h = hashlib.sha256(pptx.__version__.encode())
+        for path in ENGINE_SOURCES:
+            h.update(file_digest(path).encode())
+        return h.hexdigest()
+
+    def fingerprints(self, spec):
+        """Fingerprint of each slide of a resolved deck spec"""
+        engine = self._engine_digest()
+        templates = spec.get('templates', {})
+        size = spec.get('size', (13.333, 7.5))
+        result = []
+        for slide_spec in spec['slides']:
+            used = sorted(_templates_used(slide_spec, set()))
+            slide_templates = {name: templates.get(name) for name in used}
+            payload = {
+                'engine': engine,
+                'size': size,
+                'slide': slide_spec,
+                'templates': slide_templates,
+                'images': [library().digest(path) for path in image_files([slide_spec, slide_templates])],
+            }
+            blob = json.dumps(payload, sort_keys=True).encode()
+            result.append(hashlib.sha256(blob).hexdigest())
+        return result
+
+    def _path(self, fingerprint):
+        return os.path.join(self.cache_dir, f'{fingerprint}.pickle')
+
+    def _load(self, fingerprint):
+        path = self._path(fingerprint)
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)
+        return snapshot
+
+    def _save(self, fingerprint, snapshot):
+        tmp = self._path(fingerprint) + f'.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(fingerprint))
+
+    def prune(self, max_snapshots=MAX_SNAPSHOTS):
+        """Remove the least recently used snapshots beyond max_snapshots"""
+        entries = sorted(
+            (os.stat(os.path.join(self.cache_dir, name)).st_mtime, name)
+            for name in os.listdir(self.cache_dir) if name.endswith('.pickle')
+        )
+        for _, name in entries[:max(0, len(entries) - max_snapshots)]:
+            os.remove(os.path.join(self.cache_dir, name))
+
+    def build(self, spec, output_path, params=None):
+        """Write the deck, rendering only changed slides; returns indexes of re-rendered slides"""
+        spec = resolve_deck(spec, params)
+        templates = spec.get('templates', {})
+        rebuilt = []
+        with StreamingDeckWriter(output_path, setup_presentation(spec)) as writer:
+            for i, (slide_spec, fingerprint) in enumerate(zip(spec['slides'], self.fingerprints(spec))):
+                snapshot = self._load(fingerprint)
+                if snapshot is None:
+                    add_spec_slide(writer.prs, slide_spec, templates)
+                    snapshot, = writer.pop_snapshots()
+                    self._save(fingerprint, snapshot)
+                    rebuilt.append(i)
+                writer.write_snapshot(snapshot)
+        self.prune()
+        return rebuilt
+
+
+def _stamps(paths):
+    return [file_stamp(path) for path in paths]
+
+
+def watch(spec_path, output_path, load_spec, interval=0.25):
+    """Rebuild output_path whenever the spec, or an image it shows, changes
+
+    Polls the same inputs the slide fingerprints hash. The engine sources
+    are also part of them, but this process is running the engine it
+    imported, so when they change it re-executes itself (and rebuilds on
+    start) instead of caching slides rendered by the old code.
+    """
+    builder = IncrementalDeckBuilder()
+    engine = _stamps(ENGINE_SOURCES)
+    inputs, last = [spec_path], None
+    print(f"Watching {spec_path} (Ctrl-C to stop)")
+    try:
+        while True:
+            if _stamps(ENGINE_SOURCES) != engine:
+                print("Deck engine changed; restarting to load it", flush=True)
+                os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+            stamps = _stamps(inputs)
+            if stamps != last:
+                last = stamps
+                start = time.perf_counter()
+                try:
+                    spec = load_spec(spec_path)
+                    images = image_files(resolve_deck(spec))
+                    if images != inputs[1:]:
+                        inputs = [spec_path, *images]
+                        last = _stamps(inputs)
+                    rebuilt = builder.build(spec, output_path)
+                except Exception as e:  # keep watching through a bad edit
+                    print(f"Build failed: {e}")
+                else:
+                    slides = ', '.join(str(i + 1) for i in rebuilt) or 'none'
+                    print(f"{time.strftime('%H:%M:%S')}  {(time.perf_counter() - start) * 1000:.0f}ms  "
+                          f"re-rendered slides: {slides}  -> {output_path}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""Build .pptx decks from a declarative slide spec.
+
+A deck spec (JSON/YAML, see specs/deloitte_deck.json) looks like:
+
+    {
+      "size": [13.333, 7.5],
+      "templates": {"stat": [ ...elements... ]},
+      "slides": [
+        {
+          "theme": "light",
+          "label": "THE PROBLEM",
+          "title": {"text": "AI capability is compounding.", "h": 1},
+          "subtitle": "Most deployments stall ...",
+          "elements": [ ...elements... ]
+        }
+      ]
+    }
+
+Slides get a named theme (THEMES) and an optional label/title/subtitle
+header placed at HEADER defaults; any header part can be a string or a
+dict overriding the defaults. Elements are:
+
+    text     {x, y, w, h, text, size, bold, color, align}
+             or {..., paragraphs, pitch} for several paragraphs in one box,
+             each a string or a list of runs ({text, bold, color, size})
+    card     {x, y, w, h, fill}                      rounded rectangle
+    bullets  {x, y, w, h, items, step, marker, size, color}   one text box
+    image    {x, y, w, h, src, fit, trim, shape, dpi, backdrop, pad}   see deck_images
+             src is relative to the repo root (empty: nothing is drawn, e.g.
+             a client without a logo); fit is "contain" (default), "cover"
+             or "stretch"; trim drops transparent or flat-colour margins;
+             shape "oval" clips the picture to an ellipse (round headshots);
+             backdrop puts a rounded card of that color behind the box, with
+             the picture inset by pad
+    grid     {x, y, dx, dy, columns, items, template}
+
+A grid places one copy of `template` (a list of elements, or the name of
+one in "templates") per item, at x + col * dx, y + row * dy. Element
+positions inside a template are offsets from that cell, and strings
+inside it are formatted with the item's fields: "{title}" or, for
+non-text values such as colors and bullet lists, the raw field value.
+
+Any string in the spec may reference deck parameters as ``${name}``; the
+"params" section holds their defaults and build_deck(spec, params=...)
+overrides them, so one spec serves every client. ``$`` not followed by
+a name (as in "$50,000") is left alone.
+
+Colors are theme roles ("text", "muted"), PALETTE names or "#rrggbb".
+Positions and sizes are in inches, font sizes in points.
+"""
+import re
+from string import Template
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.enum.shapes import MSO_SHAPE
+
+from deck_images import FITS, library
+from timing import item, stage, tally
+
+# Define colors
+PALETTE = {
+    'slate_50': RGBColor(248, 250, 252),
+    'slate_300': RGBColor(203, 213, 225),
+    'slate_400': RGBColor(148, 163, 184),
+    'slate_600': RGBColor(71, 85, 105),
+    'slate_900': RGBColor(15, 23, 42),
+    'blue': RGBColor(59, 130, 246),
+    'purple': RGBColor(139, 92, 246),
+    'emerald': RGBColor(16, 185, 129),
+    'amber': RGBColor(245, 158, 11),
+    'white': RGBColor(255, 255, 255),
+    'deloitte_green': RGBColor(134, 188, 37),
+}
+
+# Named slide themes: background plus the colors text/muted roles resolve to
+THEMES = {
+    'dark': {'background': 'slate_900', 'text': 'white', 'muted': 'slate_400', 'accent': 'blue'},
+    'light': {'background': 'slate_50', 'text': 'slate_900', 'muted': 'slate_600', 'accent': 'blue'},
+}
+
+ALIGN = {
+    'left': PP_ALIGN.LEFT,
+    'center': PP_ALIGN.CENTER,
+    'right': PP_ALIGN.RIGHT,
+}
+
+# Default geometry for the slide header parts
+HEADER = {
+    'label': {'x': 0.8, 'y': 0.5, 'w': 3, 'h': 0.4, 'size': 12, 'bold': True, 'color': 'accent'},
+    'title': {'x': 0.8, 'y': 0.9, 'w': 11, 'h': 0.8, 'size': 40, 'bold': True, 'color': 'text'},
+    'subtitle': {'x': 0.8, 'y': 1.8, 'w': 10, 'h': 0.5, 'size': 16, 'color': 'muted'},
+}
+
+# Approximate single-spaced line height as a multiple of the font size
+LINE_HEIGHT = 1.2
+
+_FIELD = re.compile(r'^\{(\w+)\}$')
+
+
+class SpecError(ValueError):
+    """Raised for malformed deck specs"""
+
+
+def resolve_color(name, theme):
+    """Theme role, palette name or #rrggbb -> RGBColor"""
+    if isinstance(name, RGBColor):
+        return name
+    name = theme.get(name, name)
+    if name in PALETTE:
+        return PALETTE[name]
+    if isinstance(name, str) and name.startswith('#') and len(name) == 7:
+        return RGBColor.from_string(name[1:])
+    raise SpecError(f"Unknown color: {name!r}")
+
+
+def add_slide(prs, theme):
+    """Add a blank slide with the theme's full-bleed background"""
+    slide_layout = prs.slide_layouts[6]  # Blank
+    slide = prs.slides.add_slide(slide_layout)
+
+    background = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height)
+    background.fill.solid()
+    background.fill.fore_color.rgb = resolve_color('background', theme)
+    background.line.fill.background()
+
+    return slide
+
+
+def add_text_box(slide, left, top, width, height, text, font_size=18, bold=False, color=PALETTE['white'],
+                 align=PP_ALIGN.LEFT):
+    """Add a text box to a slide"""
+    txBox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(font_size)
+    p.font.bold = bold
+    p.font.color.rgb = color
+    p.alignment = align
+    return txBox
+
+
+def add_text_block(slide, left, top, width, height, paragraphs, font_size=18, bold=False,
+                   color=PALETTE['white'], align=PP_ALIGN.LEFT, pitch=None):
+    """Add several paragraphs to a single text box
+
+    Each paragraph is a string or a list of runs; a run is a string or a dict
+    with "text" and optional "bold"/"color"/"size" overriding the block's.
+    `pitch` (inches) is the distance between paragraph tops, so a block
+    lines up with a column of one-line text boxes placed `pitch` apart.
+    """
+    txBox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    for i, paragraph in enumerate(paragraphs):
+        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+        p.font.size = Pt(font_size)
+        p.font.bold = bold
+        p.font.color.rgb = color
+        p.alignment = align
+        if i and pitch is not None:
+            p.space_before = Pt(max(0.0, pitch * 72 - LINE_HEIGHT * font_size))
+        for run_spec in ([paragraph] if isinstance(paragraph, str) else paragraph):
+            if isinstance(run_spec, str):
+                run_spec = {'text': run_spec}
+            run = p.add_run()
+            run.text = run_spec['text']
+            if 'size' in run_spec:
+                run.font.size = Pt(run_spec['size'])
+            if 'bold' in run_spec:
+                run.font.bold = run_spec['bold']
+            if 'color' in run_spec:
+                run.font.color.rgb = run_spec['color']
+    return txBox
+
+
+def _fill(value, entry):
+    """Substitute an item's fields into a template value"""
+    if isinstance(value, str):
+        match = _FIELD.match(value)
+        if match:
+            return entry[match.group(1)]
+        return value.format_map(entry)
+    if isinstance(value, list):
+        return [_fill(v, entry) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, entry) for k, v in value.items()}
+    return value
+
+
+def _runs(paragraph, theme):
+    """Resolve run colors in a spec paragraph"""
+    if isinstance(paragraph, str):
+        return paragraph
+    return [run if isinstance(run, str) or 'color' not in run
+            else {**run, 'color': resolve_color(run['color'], theme)}
+            for run in paragraph]
+
+
+def _draw_text(slide, el, theme, x, y):
+    if 'paragraphs' in el:
+        add_text_block(slide, x + el['x'], y + el['y'], el['w'], el['h'],
+                       [_runs(p, theme) for p in el['paragraphs']],
+                       font_size=el.get('size', 18), bold=el.get('bold', False),
+                       color=resolve_color(el.get('color', 'text'), theme),
+                       align=ALIGN[el.get('align', 'left')], pitch=el.get('pitch'))
+        return
+    add_text_box(slide, x + el['x'], y + el['y'], el['w'], el['h'], el['text'],
+                 font_size=el.get('size', 18), bold=el.get('bold', False),
+                 color=resolve_color(el.get('color', 'text'), theme),
+                 align=ALIGN[el.get('align', 'left')])
+
+
+def _draw_card(slide, el, theme, x, y):
+    box = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(x + el['x']), Inches(y + el['y']),
+                                 Inches(el['w']), Inches(el['h']))
+    box.fill.solid()
+    box.fill.fore_color.rgb = resolve_color(el.get('fill', 'white'), theme)
+
+
+def _draw_bullets(slide, el, theme, x, y):
+    # One shape for the whole list, paragraphs spaced like the old one-box-per-line layout
+    marker = el.get('marker', '•')
+    step = el.get('step', 0.35)
+    items = el['items']
+    add_text_block(slide, x + el['x'], y + el['y'], el['w'], el.get('h', 0.3) + step * (len(items) - 1),
+                   [f"{marker} {text}" for text in items], font_size=el.get('size', 11),
+                   color=resolve_color(el.get('color', 'muted'), theme),
+                   align=ALIGN[el.get('align', 'left')], pitch=step)
+
+
+def _draw_image(slide, el, theme, x, y):
+    fit = el.get('fit', 'contain')
+    if fit not in FITS:
+        raise SpecError(f"Unknown image fit: {fit!r}")
+    if not el['src']:
+        return
+    if 'backdrop' in el:
+        _draw_card(slide, {**el, 'fill': el['backdrop']}, theme, x, y)
+    pad = el.get('pad', 0)
+    try:
+        picture = library().place(slide, el['src'], x + el['x'] + pad, y + el['y'] + pad,
+                                  el['w'] - 2 * pad, el['h'] - 2 * pad,
+                                  fit=fit, trim=el.get('trim', False), dpi=el.get('dpi'))
+    except FileNotFoundError as e:
+        raise SpecError(str(e)) from None
+    if el.get('shape') == 'oval':
+        picture.auto_shape_type = MSO_SHAPE.OVAL
+
+
+def _draw_grid(slide, el, theme, x, y, templates):
+    template = el['template']
+    if isinstance(template, str):
+        if template not in templates:
+            raise SpecError(f"Unknown template: {template!r}")
+        template = templates[template]
+    columns = el.get('columns') or len(el['items'])
+    for i, entry in enumerate(el['items']):
+        cell_x = el['x'] + (i % columns) * el.get('dx', 0)
+        cell_y = el.get('y', 0) + (i // columns) * el.get('dy', 0)
+        for child in template:
+            draw_element(slide, _fill(child, entry), theme, templates, x + cell_x, y + cell_y)
+
+
+ELEMENTS = {
+    'text': _draw_text,
+    'card': _draw_card,
+    'bullets': _draw_bullets,
+    'image': _draw_image,
+}
+
+
+def draw_element(slide, el, theme, templates, x=0, y=0):
+    """Draw one spec element, offset by (x, y) when inside a grid cell"""
+    kind = el.get('type', 'text')
+    if kind == 'grid':
+        _draw_grid(slide, el, theme, x, y, templates)
+    elif kind in ELEMENTS:
+        el = {'x': 0, 'y': 0, **el}
+        ELEMENTS[kind](slide, el, theme, x, y)
+    else:
+        raise SpecError(f"Unknown element type: {kind!r}")
+
+
+@stage('construction')
+def add_spec_slide(prs, spec, templates=None):
+    """Add one slide from its spec (timed as a row of the per-slide table)"""
+    with item('slide', spec.get('name', '')) as row:
+        theme = THEMES[spec.get('theme', 'dark')]
+        if 'accent' in spec:
+            theme = {**theme, 'accent': spec['accent']}
+        slide = add_slide(prs, theme)
+        for part in ('label', 'title', 'subtitle'):
+            if part in spec:
+                value = spec[part]
+                el = {**HEADER[part], **(value if isinstance(value, dict) else {'text': value})}
+                draw_element(slide, el, theme, templates or {})
+        for el in spec.get('elements', []):
+            draw_element(slide, el, theme, templates or {})
+        tally('shapes', len(slide.shapes))
+        row['shapes'] = len(slide.shapes)
+    return slide
+
+
+def apply_params(value, params):
+    """Substitute ${name} deck parameters into every string of a spec"""
+    if isinstance(value, str):
+        return Template(value).safe_substitute(params) if '$' in value else value
+    if isinstance(value, list):
+        return [apply_params(v, params) for v in value]
+    if isinstance(value, dict):
+        return {k: apply_params(v, params) for k, v in value.items()}
+    return value
+
+
+def resolve_deck(spec, params=None):
+    """Apply ${name} parameters (spec defaults plus overrides), dropping the params section"""
+    params = {**spec.get('params', {}), **(params or {})}
+    return apply_params({k: v for k, v in spec.items() if k != 'params'}, params)
+
+
+def setup_presentation(spec, prs=None):
+    """A Presentation sized for a resolved deck spec"""
+    if prs is None:
+        prs = Presentation()
+    width, height = spec.get('size', (13.333, 7.5))
+    prs.slide_width = Inches(width)
+    prs.slide_height = Inches(height)
+    return prs
+
+
+def build_deck(spec, prs=None, params=None, after_slide=None):
+    """Build a Presentation from a deck spec, with optional parameter overrides
+
+    `after_slide(slide)` is called as each slide is finished (the streaming
+    writer uses it to flush slides to disk as they are produced).
+    """
+    spec = resolve_deck(spec, params)
+    prs = setup_presentation(spec, prs)
+    templates = spec.get('templates', {})
+    for slide_spec in spec['slides']:
+        slide = add_spec_slide(prs, slide_spec, templates)
+        if after_slide is not None:
+            after_slide(slide)
+    return prs
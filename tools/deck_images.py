@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Pictures for decks: downscaled to their placed size once, cached, embedded once per deck.
+
+A deck ``image`` element names a source file (relative to the repo root)
+and the box it is placed in. Before the picture is embedded,
+ImageLibrary.prepare():
+
+- trims transparent or flat-colour margins when asked ("trim": true, for
+  padded logos)
+- crops to the box's aspect ratio ("fit": "cover"), keeps the whole image
+  centered in the box ("contain", the default) or fills the box ("stretch")
+- downscales to the placed size at `dpi` (220, PowerPoint's default
+  picture resolution), never upscaling, and encodes JPEG sources as JPEG
+  and everything else as the smallest PNG (optimize_assets.optimize_png)
+
+Prepared images are kept in memory and in ``build/.image-cache``, keyed by
+source content and placement, so later decks and batch workers skip the
+resizing. Their bytes are deterministic, so python-pptx and the streaming
+writer keep one media part per image however many slides show it; a
+smaller placement of an image already prepared at a larger size reuses
+that one.
+
+    picture = library().place(slide, 'assets/images/team/nad.jpeg', 1, 1, 1.1, 1.1, fit='cover')
+    count, size = media_footprint('deck.pptx')
+"""
+import hashlib
+import io
+import json
+import os
+import pickle
+import zipfile
+from collections import Counter, namedtuple
+
+import numpy as np
+from PIL import Image, ImageChops, ImageOps
+from pptx.util import Inches
+
+from optimize_assets import encode, optimize_png
+from render_cache import REPO_ROOT, file_digest, file_stamp
+from timing import stage
+
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, 'build', '.image-cache')
+DEFAULT_DPI = 220
+JPEG_QUALITY = 85
+# Largest per-channel difference from the corner color still counted as margin
+FLAT_TOLERANCE = 12
+FITS = ('contain', 'cover', 'stretch')
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+
+# Bump when resampling or encoding changes so cached images are re-made
+CACHE_VERSION = 3
+
+# Encoded picture, its extension and pixel size; `full` if it is the whole-resolution source
+Prepared = namedtuple('Prepared', 'blob ext size full')
+
+
+def resolve_path(src):
+    """Image paths in specs are relative to the repo root"""
+    return src if os.path.isabs(src) else os.path.join(REPO_ROOT, src)
+
+
+def image_files(spec):
+    """Sorted paths of the existing image files any string in a spec refers to"""
+    found = set()
+
+    def walk(value):
+        if isinstance(value, dict):
+            for v in value.values():
+                walk(v)
+        elif isinstance(value, list):
+            for v in value:
+                walk(v)
+        elif isinstance(value, str) and value.lower().endswith(IMAGE_EXTS):
+            path = resolve_path(value)
+            if os.path.isfile(path):
+                found.add(path)
+
+    walk(spec)
+    return sorted(found)
+
+
+def media_footprint(path):
+    """(number of media files, their total bytes) in a .pptx"""
+    with zipfile.ZipFile(path) as z:
+        media = [info for info in z.infolist() if info.filename.startswith('ppt/media/')]
+    return len(media), sum(info.file_size for info in media)
+
+
+def opaque_bbox(img):
+    """Bounding box of the pixels that aren't fully transparent, or None if the image has no alpha
+
+    Palette images are measured on their indices, so a large padded logo
+    needn't be expanded to RGBA just to find its margins.
+    """
+    if img.mode in ('RGBA', 'LA', 'PA'):
+        return img.getchannel('A').getbbox()
+    transparency = img.info.get('transparency')
+    if img.mode != 'P' or transparency is None:
+        return None
+    visible = np.ones(256, bool)   # palette index -> not fully transparent
+    if isinstance(transparency, bytes):
+        visible[:len(transparency)] = np.frombuffer(transparency, np.uint8) > 0
+    else:
+        visible[transparency] = False
+    opaque_rows = np.zeros(img.height, bool)
+    opaque_cols = np.zeros(img.width, bool)
+    for top in range(0, img.height, 256):   # in bands, so no full-size copy is ever made
+        band = img.crop((0, top, img.width, min(img.height, top + 256)))
+        band = visible[np.frombuffer(band.tobytes(), np.uint8).reshape(band.height, band.width)]
+        opaque_rows[top:top + band.shape[0]] = band.any(axis=1)
+        opaque_cols |= band.any(axis=0)
+    rows, cols = np.flatnonzero(opaque_rows), np.flatnonzero(opaque_cols)
+    if not len(rows):
+        return None
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def flat_margin_bbox(img):
+    """Bounding box inside a flat-colour border, or None if the corners don't share one color"""
+    rgb = img.convert('RGB')
+    corners = [rgb.getpixel(xy) for xy in ((0, 0), (rgb.width - 1, 0), (0, rgb.height - 1),
+                                          (rgb.width - 1, rgb.height - 1))]
+    if any(max(abs(a - b) for a, b in zip(corner, corners[0])) > FLAT_TOLERANCE for corner in corners):
+        return None
+    diff = ImageChops.difference(rgb, Image.new('RGB', rgb.size, corners[0]))
+    return diff.point(lambda v: 255 if v > FLAT_TOLERANCE else 0).getbbox()
+
+
+def target_size(size, box, fit):
+    """Pixel size for an image of `size` placed in a box of `box` pixels, never upscaled"""
+    width, height = size
+    if fit == 'stretch':
+        return min(width, round(box[0])), min(height, round(box[1]))
+    # contain: the whole image fits the box; cover: already cropped to its aspect ratio
+    scale = min(1.0, box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class ImageLibrary:
+    """Prepared (trimmed, cropped, downscaled, encoded) deck images, in memory and on disk"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, dpi=DEFAULT_DPI):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.stats = Counter()
+        self._digests = {}    # path -> (file stamp, sha256)
+        self._prepared = {}   # cache key -> Prepared
+        self._largest = {}    # (digest, fit, trim, box aspect) -> largest Prepared so far
+
+    def clear(self):
+        """Forget prepared images held in memory (the disk cache is kept)"""
+        self._prepared.clear()
+        self._largest.clear()
+
+    def digest(self, path):
+        """SHA-256 of a source image, re-read only when its stamp changes"""
+        stamp = file_stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(f"Image not found: {path}")
+        cached = self._digests.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = self._digests[path] = (stamp, file_digest(path))
+        return cached[1]
+
+    def _covers(self, prepared, width, height, fit, dpi):
+        """True if `prepared` has at least the pixels a (width, height)-inch placement needs"""
+        if prepared.full:
+            return True
+        pw, ph = prepared.size
+        if fit == 'contain':
+            scale = min(width / pw, height / ph)
+            width, height = pw * scale, ph * scale
+        return pw >= round(width * dpi) and ph >= round(height * dpi)
+
+    def prepare(self, src, width, height, fit='contain', trim=False, dpi=None):
+        """The Prepared picture for `src` placed in a width x height (inches) box"""
+        dpi = dpi or self.dpi
+        path = resolve_path(src)
+        digest = self.digest(path)
+        variant = (digest, fit, trim, None if fit == 'contain' else round(width / height, 3))
+        largest = self._largest.get(variant)
+        if largest is not None and self._covers(largest, width, height, fit, dpi):
+            self.stats['reused'] += 1
+            return largest
+
+        key = hashlib.sha256(json.dumps(
+            [CACHE_VERSION, digest, fit, trim, round(width, 4), round(height, 4), dpi]).encode()).hexdigest()
+        prepared = self._prepared.get(key) or self._load(key)
+        if prepared is None:
+            with stage('images'):
+                prepared = self._make(path, width * dpi, height * dpi, fit, trim)
+            self._save(key, prepared)
+            self.stats['prepared'] += 1
+            self.stats['source bytes'] += os.path.getsize(path)
+            self.stats['prepared bytes'] += len(prepared.blob)
+        self._prepared[key] = prepared
+        if largest is None or prepared.size[0] * prepared.size[1] > largest.size[0] * largest.size[1]:
+            self._largest[variant] = prepared
+        return prepared
+
+    def _make(self, path, box_width, box_height, fit, trim):
+        with Image.open(path) as img:
+            fmt = img.format
+            source_size = img.size
+            orientation = img.getexif().get(0x0112, 1)
+            if fmt == 'JPEG':
+                # Decode big photos at a reduced scale straight away (still >= the target). draft()
+                # sees the stored image, which EXIF orientations 5-8 turn a quarter turn for display.
+                box = (box_height, box_width) if orientation in (5, 6, 7, 8) else (box_width, box_height)
+                scale = (max if fit == 'cover' else min)(box[0] / img.width, box[1] / img.height)
+                if scale < 0.5:
+                    img.draft('RGB', (round(img.width * scale), round(img.height * scale)))
+            drafted = img.size != source_size
+            img = ImageOps.exif_transpose(img)
+        changed = drafted or orientation != 1
+        if trim:
+            bbox = opaque_bbox(img) or flat_margin_bbox(img)
+            if bbox and bbox != (0, 0, *img.size):
+                img = img.crop(bbox)
+                changed = True
+        if img.mode in ('P', 'LA', 'PA') or 'transparency' in img.info:
+            img = img.convert('RGBA')
+        elif img.mode not in ('RGB', 'RGBA', 'L'):
+            img = img.convert('RGB')
+        if fit == 'cover':
+            # Centered crop to the box's aspect ratio
+            aspect = box_width / box_height
+            width, height = img.size
+            crop_w, crop_h = min(width, round(height * aspect)), min(height, round(width / aspect))
+            if (crop_w, crop_h) != img.size:
+                left, top = (width - crop_w) // 2, (height - crop_h) // 2
+                img = img.crop((left, top, left + crop_w, top + crop_h))
+                changed = True
+
+        size = target_size(img.size, (box_width, box_height), fit)
+        full = size == img.size and not drafted
+        if size != img.size:
+            img = img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+            changed = True
+        if not changed and fmt in ('PNG', 'JPEG'):
+            with open(path, 'rb') as f:
+                return Prepared(f.read(), 'jpg' if fmt == 'JPEG' else 'png', size, full)
+        if fmt == 'JPEG' and img.mode != 'RGBA':
+            return Prepared(encode(img, 'JPEG', quality=JPEG_QUALITY, optimize=True), 'jpg', size, full)
+        _, (blob, _) = optimize_png(encode(img, 'PNG'))
+        return Prepared(blob, 'png', size, full)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pickle')
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                prepared = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self.stats['cached'] += 1
+        return prepared
+
+    def _save(self, key, prepared):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(prepared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+
+    def place(self, slide, src, left, top, width, height, fit='contain', trim=False, dpi=None):
+        """Add `src` to a slide in the given box (inches); returns the Picture shape"""
+        prepared = self.prepare(src, width, height, fit, trim, dpi)
+        self.stats['placed'] += 1
+        if fit == 'contain':
+            pw, ph = prepared.size
+            scale = min(width / pw, height / ph)
+            left += (width - pw * scale) / 2
+            top += (height - ph * scale) / 2
+            width, height = pw * scale, ph * scale
+        return slide.shapes.add_picture(io.BytesIO(prepared.blob), Inches(left), Inches(top),
+                                        Inches(width), Inches(height))
+
+    def summary(self):
+        s = self.stats
+        line = (f"images: {s['placed']} placed, {s['prepared']} prepared, {s['cached']} from disk cache, "
+                f"{s['reused']} reused")
+        if s['prepared']:
+            line += f"; {s['source bytes']:,} source bytes downscaled to {s['prepared bytes']:,}"
+        return line
+
+
+_library = None
+
+
+def library():
+    """The process-wide ImageLibrary"""
+    global _library
+    if _library is None:
+        _library = ImageLibrary()
+    return _library
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Drawing primitives shared by the cover, OG and share-card generators.
+
+- gradient_bar: horizontal color ramp filled from one computed strip
+- draw_grid: background grid lines
+- text_size: text metrics cached by (font, string)
+- layout_pills / draw_pills: rounded badges laid out as a batch
+- draw_text_lines: stacked lines of text
+- text_length / wrap_text / text_offset: advance widths, word wrap, CSS line boxes
+- draw_tracked_text / gradient_text: letter-spaced and gradient-filled text
+- layout_tags / draw_tags: auto-sized outlined badges in a row
+- rounded_gradient / drop_shadow: gradient tiles and blurred box shadows
+
+Colors are RGB tuples. Fonts come from fonts.get_font(), which hands out
+the same object for the same (family, weight, size), so caching metrics by
+font object is safe.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from gradients import linear_gradient_stops
+
+
+def gradient_bar(img, box, start, end):
+    """Fill box (left, top, right, bottom; right/bottom exclusive) with a left-to-right ramp
+
+    Column x gets int(start + (x - left) / width * (end - start)), matching
+    the old one-draw.line-per-column loop pixel for pixel.
+    """
+    left, top, right, bottom = box
+    width, height = right - left, bottom - top
+    factor = np.arange(width) / width
+    strip = np.empty((1, width, 3), dtype=np.uint8)
+    for channel in range(3):
+        strip[0, :, channel] = start[channel] + factor * (end[channel] - start[channel])
+    bar = Image.fromarray(np.broadcast_to(strip, (height, width, 3)).copy(), 'RGB')
+    img.paste(bar, (left, top))
+
+
+def draw_grid(draw, size, step, color, offset=(0, 0), width=1):
+    """Grid lines every `step` pixels across an image of `size`"""
+    size_x, size_y = size
+    for x in range(offset[0], size_x, step):
+        draw.line([(x, 0), (x, size_y)], fill=color, width=width)
+    for y in range(offset[1], size_y, step):
+        draw.line([(0, y), (size_x, y)], fill=color, width=width)
+
+
+@lru_cache(maxsize=4096)
+def text_size(font, text):
+    """(width, height) of text's bounding box in `font`"""
+    left, top, right, bottom = font.getbbox(text)
+    return right - left, bottom - top
+
+
+@lru_cache(maxsize=4096)
+def text_length(font, text):
+    """Advance width of text in `font` (where the next glyph would start)"""
+    return font.getlength(text)
+
+
+def text_offset(font, line_height):
+    """Offset from the top of a CSS line box to where draw.text() puts the text
+
+    CSS splits (line-height - ascent - descent) evenly above and below the glyphs.
+    """
+    ascent, descent = font.getmetrics()
+    return (line_height - ascent - descent) / 2
+
+
+def wrap_text(font, text, max_width):
+    """Greedy word wrap into lines no wider than max_width (a single long word may exceed it)"""
+    lines, line = [], ''
+    for word in text.split():
+        candidate = f'{line} {word}' if line else word
+        if line and text_length(font, candidate) > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def pill_colors(color):
+    """(background, text) colors for a pill of a given accent color"""
+    background = (color[0] // 4, color[1] // 4, color[2] // 4)
+    text = (min(color[0] + 60, 255), min(color[1] + 60, 255), min(color[2] + 60, 255))
+    return background, text
+
+
+def layout_pills(pills, font, origin, step, size=(160, 32), text_dy=7):
+    """Positions for a batch of (text, color) pills
+
+    Pill i sits at origin + i * step (step is an (dx, dy) pair); text is
+    centered horizontally and `text_dy` pixels below the pill's top.
+    Returns (box, text_xy, text, background, text_color) per pill.
+    """
+    (x0, y0), (dx, dy), (width, height) = origin, step, size
+    layout = []
+    for i, (text, color) in enumerate(pills):
+        x, y = x0 + i * dx, y0 + i * dy
+        text_width, _ = text_size(font, text)
+        background, text_color = pill_colors(color)
+        layout.append((
+            [(x, y), (x + width, y + height)],
+            (x + (width - text_width) // 2, y + text_dy),
+            text, background, text_color,
+        ))
+    return layout
+
+
+def draw_pills(draw, pills, font, origin, step, size=(160, 32), radius=16, text_dy=7):
+    """Draw a batch of (text, color) pills laid out by layout_pills()"""
+    layout = layout_pills(pills, font, origin, step, size, text_dy)
+    for box, _, _, background, _ in layout:
+        draw.rounded_rectangle(box, radius=radius, fill=background)
+    for _, text_xy, text, _, text_color in layout:
+        draw.text(text_xy, text, fill=text_color, font=font)
+    return layout
+
+
+def draw_text_lines(draw, xy, lines, font, fills, line_gap):
+    """Draw lines top to bottom, `line_gap` pixels apart; fills is one color or one per line"""
+    x, y = xy
+    if isinstance(fills, (str, tuple)):
+        fills = [fills] * len(lines)
+    for i, (line, fill) in enumerate(zip(lines, fills)):
+        draw.text((x, y + i * line_gap), line, fill=fill, font=font)
+
+
+def draw_tracked_text(draw, xy, text, font, fill, tracking):
+    """Draw text with `tracking` extra pixels after each character (CSS letter-spacing); returns the end x"""
+    x, y = xy
+    for ch in text:
+        draw.text((x, y), ch, fill=fill, font=font)
+        x += text_length(font, ch) + tracking
+    return x
+
+
+def gradient_text(img, xy, text, font, stops, angle=90):
+    """Draw text filled with a gradient across its box (CSS background-clip: text); returns the end x"""
+    ascent, descent = font.getmetrics()
+    width = max(math.ceil(text_length(font, text)), font.getbbox(text)[2])
+    mask = Image.new('L', (width, ascent + descent))
+    ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+    x, y = xy
+    img.paste(linear_gradient_stops(mask.size, stops, angle), (round(x), round(y)), mask)
+    return x + text_length(font, text)
+
+
+def layout_tags(tags, font, xy, padding, gap, line_height):
+    """Boxes for a left-to-right row of tags sized to their text
+
+    padding is (horizontal, vertical) in pixels; returns (box, text_xy, text)
+    per tag.
+    """
+    x, y = xy
+    pad_x, pad_y = padding
+    height = line_height + 2 * pad_y
+    text_dy = pad_y + text_offset(font, line_height)
+    layout = []
+    for text in tags:
+        width = text_length(font, text) + 2 * pad_x
+        layout.append(([(x, y), (x + width, y + height)], (x + pad_x, y + text_dy), text))
+        x += width + gap
+    return layout
+
+
+def draw_tags(draw, tags, font, xy, padding, gap, line_height, radius,
+              fill, outline, text_fill, outline_width=1):
+    """Draw a row of tags laid out by layout_tags(); use an RGBA draw for translucent fills"""
+    layout = layout_tags(tags, font, xy, padding, gap, line_height)
+    for box, _, _ in layout:
+        draw.rounded_rectangle(box, radius=radius, fill=fill, outline=outline, width=outline_width)
+    for _, text_xy, text in layout:
+        draw.text(text_xy, text, fill=text_fill, font=font)
+    return layout
+
+
+def rounded_gradient(img, box, stops, radius, angle=90):
+    """Paste a rounded rectangle filled with a linear gradient through (offset, color) stops"""
+    left, top, right, bottom = box
+    size = (right - left, bottom - top)
+    mask = Image.new('L', size)
+    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), (size[0] - 1, size[1] - 1)], radius=radius, fill=255)
+    img.paste(linear_gradient_stops(size, stops, angle), (left, top), mask)
+
+
+def drop_shadow(img, box, radius, color, alpha, blur, offset=(0, 0)):
+    """Paint a CSS-style ``box-shadow: dx dy blur`` for a rounded box (before drawing the box)"""
+    left, top, right, bottom = box
+    # CSS blur radius is twice the Gaussian standard deviation; 3 sigma covers the tail
+    margin = math.ceil(blur * 1.5)
+    mask = Image.new('L', (right - left + 2 * margin, bottom - top + 2 * margin))
+    ImageDraw.Draw(mask).rounded_rectangle(
+        [(margin, margin), (margin + right - left - 1, margin + bottom - top - 1)], radius=radius, fill=alpha)
+    mask = mask.filter(ImageFilter.GaussianBlur(blur / 2))
+    img.paste(tuple(color), (left + offset[0] - margin, top + offset[1] - margin), mask)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Process-wide font lookup and cache for the image generators.
+
+Fonts are looked up by (family, weight) through a fallback chain of file
+names, searched across bundled fonts in ``assets/fonts``, the user's font
+dirs, fontconfig's system dirs and macOS's font folders. Directories are
+scanned once and each font file is read from disk once. FreeType still
+parses a face once per size (Pillow's FreeTypeFont, font_variant()
+included, can't share a parsed face across sizes), so sized fonts are
+memoized by (face, size): each face is parsed once per size it is used
+at, and families or weights that fall back to the same file share it:
+
+    from fonts import get_font
+    headline = get_font('sans', 'bold', 48)
+
+Extra directories can be put first with ``WORKFLOWY_FONT_PATH``
+(os.pathsep-separated). The file picked for each face is logged at INFO.
+"""
+import io
+import logging
+import os
+import threading
+
+from PIL import ImageFont
+
+log = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEARCH_PATHS = [
+    os.path.join(REPO_ROOT, 'assets', 'fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    os.path.expanduser('~/.fonts'),
+    '/usr/local/share/fonts',
+    '/usr/share/fonts',
+    os.path.expanduser('~/Library/Fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+]
+
+# (family, weight) -> candidate (file name, face index) in order of preference.
+# Brand font first (as in the HTML templates), then macOS, then common Linux fonts.
+FAMILIES = {
+    ('sans', 'regular'): [
+        ('Poppins-Regular.ttf', 0), ('Helvetica.ttc', 0), ('SFNSDisplay.ttf', 0),
+        ('Inter-Regular.ttf', 0), ('LiberationSans-Regular.ttf', 0), ('DejaVuSans.ttf', 0),
+    ],
+    ('sans', 'medium'): [
+        ('Poppins-Medium.ttf', 0), ('Inter-Medium.ttf', 0),
+    ],
+    ('sans', 'semibold'): [
+        ('Poppins-SemiBold.ttf', 0), ('Inter-SemiBold.ttf', 0),
+    ],
+    ('sans', 'bold'): [
+        ('Poppins-Bold.ttf', 0), ('Helvetica.ttc', 1), ('SFNSDisplay-Bold.ttf', 0),
+        ('Inter-Bold.ttf', 0), ('LiberationSans-Bold.ttf', 0), ('DejaVuSans-Bold.ttf', 0),
+    ],
+    ('sans', 'extrabold'): [
+        ('Poppins-ExtraBold.ttf', 0), ('Inter-ExtraBold.ttf', 0),
+    ],
+}
+
+# Weight to try next when a family has none of the requested weight's files
+WEIGHT_FALLBACK = {
+    'medium': 'regular',
+    'semibold': 'bold',
+    'extrabold': 'bold',
+    'bold': 'regular',
+}
+
+
+class FontRegistry:
+    """Finds font files once and hands out memoized FreeTypeFont instances"""
+
+    def __init__(self, search_paths=None, families=None):
+        extra = os.environ.get('WORKFLOWY_FONT_PATH')
+        self.search_paths = [p for p in (extra.split(os.pathsep) if extra else []) if p]
+        self.search_paths += list(search_paths or SEARCH_PATHS)
+        self.families = families or FAMILIES
+        self._index = None
+        self._data = {}
+        self._faces = {}
+        self._fonts = {}   # (face, size) -> FreeTypeFont
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        """Map lower-cased file name -> first path found, walking each search dir once"""
+        index = {}
+        for root in self.search_paths:
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    if name.lower().endswith(('.ttf', '.ttc', '.otf')):
+                        index.setdefault(name.lower(), os.path.join(dirpath, name))
+        return index
+
+    def face(self, family, weight='regular'):
+        """(path, index) of the font used for family/weight, or None for Pillow's default"""
+        key = (family, weight)
+        if key not in self._faces:
+            if self._index is None:
+                self._index = self._scan()
+            found = None
+            w = weight
+            while found is None and w is not None:
+                for name, index in self.families.get((family, w), []):
+                    path = self._index.get(name.lower())
+                    if path:
+                        found = (path, index)
+                        break
+                w = WEIGHT_FALLBACK.get(w)
+            if found:
+                log.info("font %s/%s: %s (face %d)", family, weight, *found)
+            else:
+                log.warning("font %s/%s: no candidate found in %s, using Pillow's default font",
+                            family, weight, self.search_paths)
+            self._faces[key] = found
+        return self._faces[key]
+
+    def get(self, family='sans', weight='regular', size=16):
+        """Sized font for family/weight, memoized per (face, size) for the life of the process"""
+        face = self._faces.get((family, weight))
+        font = self._fonts.get((face, size)) if face is not None else None
+        if font is None:
+            with self._lock:
+                key = (self.face(family, weight), size)
+                font = self._fonts.get(key)
+                if font is None:
+                    font = self._fonts[key] = self._load(*key)
+        return font
+
+    def _load(self, face, size):
+        if face is None:
+            return ImageFont.load_default(size)
+        path, index = face
+        # Read each file once; every face and size in it is parsed from these bytes
+        if path not in self._data:
+            with open(path, 'rb') as f:
+                self._data[path] = f.read()
+        return ImageFont.truetype(io.BytesIO(self._data[path]), size, index=index)
+
+    def paths(self):
+        """Font files resolved so far (for render cache keys)"""
+        return sorted({face[0] for face in self._faces.values() if face})
+
+
+_registry = None
+
+
+def registry():
+    """The process-wide FontRegistry"""
+    global _registry
+    if _registry is None:
+        _registry = FontRegistry()
+    return _registry
+
+
+def get_font(family='sans', weight='regular', size=16):
+    return registry().get(family, weight, size)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Optimize social images after the generators run: smaller PNGs, WebP/AVIF siblings, hashed names.
+
+Usage: python tools/optimize_assets.py [IMAGE ...] [--out DIR] [--manifest PATH] [--no-avif] [--workers N]
+                                      [--pages HTML ... | --no-pages]
+
+By default every PNG in assets/images/social, the root og-image-v*.png
+copies and the generators' outputs (build/og, build/covers) is processed.
+For each source:
+
+- the PNG is palette-quantized (256 colors, dithered) when that stays above
+  --min-psnr dB against the original, else re-saved losslessly optimized;
+  whichever is smallest of that and the original is kept
+- WebP and AVIF siblings are encoded
+- every output is written as ``<name>.<content hash>.<ext>`` under --out,
+  so it can be served with ``Cache-Control: immutable`` (see vercel.json)
+
+Identical sources (e.g. og-image-v4.png and og-image-v5.png) are encoded
+once and share outputs. manifest.json maps each source to its outputs so
+pages can reference the hashed files; sources whose hash is unchanged
+since the last run are not re-encoded. Images given on the command line
+are merged into the existing manifest; the default run replaces it.
+Outputs no longer in the manifest are removed from --out, but only files
+the previous manifest listed or named like an output
+(``<name>.<hash>.<ext>``), never anything else in the directory.
+
+Finally the og:image / twitter:image tags of the site's pages (--pages,
+default the root *.html) are pointed at the hashed PNG of the source they
+reference, whether they name the source or an earlier hashed output of it.
+References to images the manifest doesn't know are reported and left as is.
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, features
+
+from render_cache import REPO_ROOT
+
+SOCIAL_DIR = os.path.join(REPO_ROOT, 'assets', 'images', 'social')
+DEFAULT_OUT = os.path.join(SOCIAL_DIR, 'dist')
+DEFAULT_MANIFEST = os.path.join(SOCIAL_DIR, 'manifest.json')
+DEFAULT_SOURCES = [os.path.join(SOCIAL_DIR, '*.png'), os.path.join(REPO_ROOT, 'og-image-v*.png'),
+                   os.path.join(REPO_ROOT, 'build', 'og', '*.png'), os.path.join(REPO_ROOT, 'build', 'covers', '*.png')]
+DEFAULT_PAGES = os.path.join(REPO_ROOT, '*.html')
+SITE_URL = 'https://workflowy.ai/'
+
+# Bump when encoder settings change so unchanged sources are re-encoded
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+MIN_PSNR = 40.0
+WEBP_QUALITY = 85
+AVIF_QUALITY = 60
+# <name>.<content hash>.<ext>, as written by process()
+OUTPUT_NAME = re.compile(rf'.+\.[0-9a-f]{{{HASH_LENGTH}}}\.(png|webp|avif)$')
+# <meta property="og:image" content="..."> and the twitter:image equivalent
+SHARE_IMAGE_TAG = re.compile(r'(<meta\s+(?:property="og:image"|name="twitter:image")\s+content=")([^"]+)(")')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def psnr(a, b):
+    """Peak signal-to-noise ratio in dB between two same-size images (inf if identical)"""
+    diff = np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)
+    mse = np.mean(diff * diff)
+    return float('inf') if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+def encode(img, fmt, **options):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return buf.getvalue()
+
+
+def optimize_png(data, min_psnr=MIN_PSNR):
+    """Smallest of: the original, a lossless optimized re-save, a quantized palette PNG within min_psnr"""
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    mode = 'RGBA' if img.mode in ('RGBA', 'LA') or 'transparency' in img.info else 'RGB'
+    img = img.convert(mode)
+    candidates = [(data, 'original'), (encode(img, 'PNG', optimize=True), 'lossless')]
+    # FASTOCTREE is the built-in quantizer that handles alpha
+    method = Image.Quantize.FASTOCTREE if mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    quantized = img.quantize(256, method=method, dither=Image.Dither.FLOYDSTEINBERG)
+    if psnr(img, quantized.convert(mode)) >= min_psnr:
+        candidates.append((encode(quantized, 'PNG', optimize=True), 'quantized'))
+    return img, min(candidates, key=lambda c: len(c[0]))
+
+
+def process(source, data, out_dir, avif=True, min_psnr=MIN_PSNR):
+    """Worker: encode one source's outputs into out_dir, returning its manifest entry"""
+    img, (png, png_kind) = optimize_png(data, min_psnr)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    outputs = {'png': png, 'webp': encode(img, 'WEBP', quality=WEBP_QUALITY, method=6)}
+    if avif:
+        outputs['avif'] = encode(img, 'AVIF', quality=AVIF_QUALITY)
+
+    entry = {'sha256': sha256(data), 'bytes': len(data), 'width': img.width, 'height': img.height,
+             'png_kind': png_kind, 'files': {}}
+    for ext, blob in outputs.items():
+        name = f'{stem}.{sha256(blob)[:HASH_LENGTH]}.{ext}'
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        entry['files'][ext] = {'path': os.path.relpath(path, REPO_ROOT), 'bytes': len(blob)}
+    return entry
+
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('assets', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def output_files(assets):
+    """Absolute paths of every output a manifest's assets refer to"""
+    return {os.path.join(REPO_ROOT, f['path']) for entry in assets.values() for f in entry['files'].values()}
+
+
+def is_current(entry, digest, avif):
+    """True if a previous manifest entry already covers this source content"""
+    return (entry is not None and entry.get('sha256') == digest and (not avif or 'avif' in entry['files'])
+            and all(os.path.exists(os.path.join(REPO_ROOT, f['path'])) for f in entry['files'].values()))
+
+
+def optimize_all(sources, out_dir=DEFAULT_OUT, manifest_path=DEFAULT_MANIFEST, avif=True,
+                 min_psnr=MIN_PSNR, workers=None, merge=False):
+    """Optimize sources (paths), write the manifest and print bytes saved per asset
+
+    With `merge`, entries for sources not given are kept from the previous
+    manifest instead of dropped.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = load_manifest(manifest_path)
+
+    # Deduplicate by content: identical files are encoded once
+    by_digest = {}
+    sources_digest = {}
+    for source in sources:
+        with open(source, 'rb') as f:
+            data = f.read()
+        digest = sha256(data)
+        key = os.path.relpath(source, REPO_ROOT)
+        sources_digest[key] = digest
+        by_digest.setdefault(digest, (key, data))
+
+    entries = {}
+    for key, digest in sources_digest.items():
+        if is_current(previous.get(key), digest, avif):
+            entries.setdefault(digest, previous[key])
+    todo = [(key, data) for digest, (key, data) in by_digest.items() if digest not in entries]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process, key, data, out_dir, avif, min_psnr) for key, data in todo]
+        for future in futures:
+            entry = future.result()
+            entries[entry['sha256']] = entry
+    if merge:
+        for key, entry in previous.items():
+            if key not in sources_digest:
+                sources_digest[key] = entry['sha256']
+                entries.setdefault(entry['sha256'], entry)
+
+    assets = {}
+    first = {}
+    for key, digest in sorted(sources_digest.items()):
+        entry = dict(entries[digest])
+        if digest in first:
+            entry['duplicate_of'] = first[digest]
+        else:
+            first[digest] = key
+            entry.pop('duplicate_of', None)
+        assets[key] = entry
+    with open(manifest_path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'assets': assets}, f, indent=2)
+        f.write('\n')
+
+    # Drop outputs nothing refers to any more; leave files this tool didn't write alone
+    referenced, listed = output_files(assets), output_files(previous)
+    for path in glob.glob(os.path.join(out_dir, '*')):
+        if path not in referenced and (path in listed or OUTPUT_NAME.match(os.path.basename(path))):
+            os.remove(path)
+
+    report(assets, encoded={key for key, _ in todo})
+    return assets, previous
+
+
+def link_pages(pages, assets, previous=None):
+    """Point the share-image tags of pages at the hashed PNGs in assets
+
+    A tag may name a source or any output the previous manifest listed for
+    it; either resolves to the source's current PNG. Returns the pages changed.
+    """
+    sources = {key: key for key in assets}
+    for key, entry in (previous or {}).items():
+        for f in entry['files'].values():
+            sources.setdefault(f['path'], key)
+
+    def relink(match):
+        url = match.group(2)
+        key = sources.get(url[len(SITE_URL):]) if url.startswith(SITE_URL) else None
+        if key not in assets:
+            missing.append(url)
+            return match.group(0)
+        return f"{match.group(1)}{SITE_URL}{assets[key]['files']['png']['path']}{match.group(3)}"
+
+    changed = []
+    for page in pages:
+        with open(page) as f:
+            html = f.read()
+        missing = []
+        linked = SHARE_IMAGE_TAG.sub(relink, html)
+        for url in dict.fromkeys(missing):
+            print(f"{os.path.basename(page)}: {url} is not in the manifest; left as is")
+        if linked != html:
+            with open(page, 'w') as f:
+                f.write(linked)
+            changed.append(page)
+    if changed:
+        print(f"Linked {len(changed)} page(s) to hashed images: "
+              f"{', '.join(os.path.basename(p) for p in changed)}")
+    return changed
+
+
+def report(assets, encoded=()):
+    """Per-asset table of original vs optimized sizes"""
+    print(f"{'asset':<44}  {'original':>9}  {'png':>9}  {'webp':>9}  {'avif':>9}  {'saved':>9}")
+    total_before = total_after = 0
+    for key, entry in assets.items():
+        files = entry['files']
+        sizes = {ext: f['bytes'] for ext, f in files.items()}
+        if 'duplicate_of' in entry:
+            note = f"= {os.path.basename(entry['duplicate_of'])}"
+            saved = entry['bytes']
+        else:
+            note = '' if key in encoded else '(unchanged)'
+            saved = entry['bytes'] - sizes['png']
+            total_after += sizes['png']
+        total_before += entry['bytes']
+        cells = [f"{sizes[ext] / 1024:>7.0f}KB" if ext in sizes else f"{'-':>9}" for ext in ('png', 'webp', 'avif')]
+        print(f"{os.path.basename(key):<44}  {entry['bytes'] / 1024:>7.0f}KB  {'  '.join(cells)}  "
+              f"{saved / 1024:>7.0f}KB  {note}")
+    print(f"PNG total: {total_before / 1024:.0f}KB -> {total_after / 1024:.0f}KB "
+          f"({total_before - total_after:,} bytes saved, duplicates counted once)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimize social images and write a hashed-asset manifest")
+    parser.add_argument('images', nargs='*', help='PNG files (default: assets/images/social/*.png, og-image-v*.png, build/og, build/covers)')
+    parser.add_argument('--out', default=DEFAULT_OUT, help='directory for the hashed outputs')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    parser.add_argument('--min-psnr', type=float, default=MIN_PSNR,
+                        help='quality floor (dB) for keeping a palette-quantized PNG')
+    parser.add_argument('--no-avif', action='store_true', help='skip AVIF siblings')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--pages', nargs='+', help='HTML pages whose share-image tags to link (default: root *.html)')
+    parser.add_argument('--no-pages', action='store_true', help="don't rewrite any page")
+    args = parser.parse_args(argv)
+
+    sources = args.images or sorted(p for pattern in DEFAULT_SOURCES for p in glob.glob(pattern))
+    avif = not args.no_avif
+    if avif and not features.check('avif'):
+        print("This Pillow build has no AVIF support; skipping AVIF siblings")
+        avif = False
+    assets, previous = optimize_all([os.path.abspath(p) for p in sources], os.path.abspath(args.out),
+                                    os.path.abspath(args.manifest), avif, args.min_psnr, args.workers,
+                                    merge=bool(args.images))
+    if not args.no_pages:
+        link_pages(args.pages or sorted(glob.glob(DEFAULT_PAGES)), assets, previous)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Write .pptx decks slide by slide instead of holding every slide in memory.
+
+python-pptx keeps the XML tree of every slide (and every picture) until
+``prs.save()``. StreamingDeckWriter instead writes each finished slide's
+part, its relationships and any new media straight into the output zip,
+then removes the slide from its scratch Presentation so the tree can be
+freed. Peak memory stays roughly flat no matter how many slides a deck
+has. ``close()`` writes the masters, layouts, theme and a presentation
+part listing the streamed slides.
+
+    with StreamingDeckWriter('catalogue.pptx') as writer:
+        build_deck(spec, writer.prs, after_slide=writer.flush)
+
+Slides may contain shapes and pictures; parts that need other per-slide
+relationships (notes slides, charts, embedded media) are not supported.
+"""
+import copy
+import zipfile
+from collections import namedtuple
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import CT_Relationships, CT_Types, serialize_part_xml
+from pptx.opc.packuri import PackURI
+from pptx.opc.spec import default_content_types
+
+from deck_engine import build_deck
+from timing import stage
+
+
+# A slide detached from its package: XML, content type and relationships as
+# (rId, reltype, target_ref, is_external, Media or None) tuples
+SlideSnapshot = namedtuple('SlideSnapshot', 'blob content_type rels')
+Media = namedtuple('Media', 'sha1 ext content_type blob')
+
+
+def snapshot_slide(part):
+    """Capture a slide part so it can be written (or cached) without its package"""
+    rels = []
+    for rel in part.rels.values():
+        if rel.is_external:
+            rels.append((rel.rId, rel.reltype, rel.target_ref, True, None))
+        elif rel.reltype == RT.SLIDE_LAYOUT:
+            # Layouts stay in the package and are written by close()
+            rels.append((rel.rId, rel.reltype, rel.target_ref, False, None))
+        elif rel.reltype == RT.IMAGE:
+            image = rel.target_part
+            media = Media(image.sha1, image.partname.ext, image.content_type, image.blob)
+            rels.append((rel.rId, rel.reltype, None, False, media))
+        else:
+            raise ValueError(f"Streaming writer can't write slide relationship {rel.reltype}")
+    return SlideSnapshot(part.blob, part.content_type, rels)
+
+
+class StreamingDeckWriter:
+    """Incrementally writes the slides added to `self.prs` into a .pptx file"""
+
+    def __init__(self, path, prs=None):
+        self.prs = prs if prs is not None else Presentation()
+        self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self._slide_count = 0
+        self._media = {}     # image sha1 -> partname written
+        self._written = {}   # partname -> content type, for [Content_Types].xml
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    def flush(self, slide=None):
+        """Write every slide added since the last flush and drop it from memory
+
+        Takes (and ignores) a slide so it can be used as build_deck's after_slide.
+        """
+        with stage('save'):
+            for snapshot in self.pop_snapshots():
+                self.write_snapshot(snapshot)
+
+    def pop_snapshots(self):
+        """Detach the slides added since the last flush, as SlideSnapshots"""
+        prs_part = self.prs.part
+        sldIdLst = self.prs.slides._sldIdLst
+        snapshots = []
+        for sldId in list(sldIdLst):
+            snapshots.append(snapshot_slide(prs_part.related_part(sldId.rId)))
+            sldIdLst.remove(sldId)
+            prs_part.drop_rel(sldId.rId)
+        return snapshots
+
+    def _write(self, partname, blob, content_type):
+        self._zip.writestr(partname.membername, blob)
+        self._written[partname] = content_type
+
+    def write_snapshot(self, snapshot):
+        """Append a slide to the package from its snapshot"""
+        self._slide_count += 1
+        partname = PackURI(f'/ppt/slides/slide{self._slide_count}.xml')
+        rels = CT_Relationships.new()
+        for rId, reltype, target_ref, is_external, media in snapshot.rels:
+            if media is not None:
+                target_ref = self._write_media(media).relative_ref(partname.baseURI)
+            rels.add_rel(rId, reltype, target_ref, is_external)
+        self._write(partname, snapshot.blob, snapshot.content_type)
+        self._zip.writestr(partname.rels_uri.membername, rels.xml_file_bytes)
+
+    def _write_media(self, media):
+        """Write an image once, however many slides use it"""
+        if media.sha1 not in self._media:
+            partname = PackURI(f'/ppt/media/image{len(self._media) + 1}.{media.ext}')
+            self._write(partname, media.blob, media.content_type)
+            self._media[media.sha1] = partname
+        return self._media[media.sha1]
+
+    def close(self):
+        """Flush remaining slides and write the rest of the package"""
+        if self._closed:
+            return
+        self.flush()
+        with stage('save'):
+            self._write_package()
+        self._closed = True
+
+    def _write_package(self):
+        """Masters, layouts, theme, presentation part and the package's own parts"""
+        prs_part = self.prs.part
+        package = prs_part.package
+
+        for part in package.iter_parts():
+            if part is prs_part:
+                continue
+            self._write(part.partname, part.blob, part.content_type)
+            if len(part.rels):
+                self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+        # presentation.xml lists the streamed slides; its rels add one per slide
+        prs_element = copy.deepcopy(prs_part._element)
+        sldIdLst = prs_element.get_or_add_sldIdLst()
+        rels = CT_Relationships.new()
+        used = set(prs_part.rels.keys())
+        for rel in prs_part.rels.values():
+            rels.add_rel(rel.rId, rel.reltype, rel.target_ref, rel.is_external)
+        n = 1
+        for i in range(1, self._slide_count + 1):
+            while f'rId{n}' in used:
+                n += 1
+            rId = f'rId{n}'
+            used.add(rId)
+            rels.add_rel(rId, RT.SLIDE, f'slides/slide{i}.xml')
+            sldIdLst._add_sldId(id=255 + i, rId=rId)
+        self._write(prs_part.partname, serialize_part_xml(prs_element), prs_part.content_type)
+        self._zip.writestr(prs_part.partname.rels_uri.membername, rels.xml_file_bytes)
+
+        self._zip.writestr('_rels/.rels', package._rels.xml)
+        self._zip.writestr('[Content_Types].xml', self._content_types_xml())
+        self._zip.close()
+
+    def _content_types_xml(self):
+        types = CT_Types.new()
+        defaults = {'rels': 'application/vnd.openxmlformats-package.relationships+xml',
+                    'xml': 'application/xml'}
+        overrides = {}
+        for partname, content_type in self._written.items():
+            ext = partname.ext.lower()
+            if (ext, content_type) in default_content_types:
+                defaults[ext] = content_type
+            else:
+                overrides[partname] = content_type
+        for ext, content_type in sorted(defaults.items()):
+            types.add_default(ext, content_type)
+        for partname, content_type in sorted(overrides.items()):
+            types.add_override(partname, content_type)
+        return serialize_part_xml(types)
+
+
+def write_deck(spec, path, params=None, prs=None):
+    """Build a deck spec straight to disk, one slide at a time"""
+    with StreamingDeckWriter(path, prs) as writer:
+        build_deck(spec, writer.prs, params, after_slide=writer.flush)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Content-addressed cache for rendered artifacts (images, decks).
+
+An artifact's key is the SHA-256 of everything that can change its bytes:
+the spec, the fonts it may load and the source of the code that renders
+it. Rendered files are stored under that key; a later render with the
+same key just copies the stored file into place.
+
+The store lives in ``build/.render-cache`` by default and is bounded in
+size: entries are touched on every hit and the least recently used ones
+are evicted first.
+
+    cache = RenderCache()
+    key = cache.key(spec, code=[__file__], fonts=FONT_PATHS)
+    if not cache.fetch(key, output_path):
+        render(spec).save(output_path)
+        cache.store(key, output_path)
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ROOT = os.path.join(REPO_ROOT, 'build', '.render-cache')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump to invalidate every entry when the key format changes
+CACHE_VERSION = 1
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_stamp(path):
+    """Cheap identity for large files (fonts): path, size and mtime, or None if missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, st.st_size, st.st_mtime_ns]
+
+
+class RenderCache:
+    """On-disk, size-bounded LRU store of rendered files keyed by input hash"""
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._code_digests = {}
+
+    def key(self, spec, code=(), fonts=()):
+        """Hash a JSON-able spec together with code files (by content) and fonts (by stamp)"""
+        code_hashes = []
+        for path in code:
+            path = os.path.abspath(path)
+            if path not in self._code_digests:
+                self._code_digests[path] = file_digest(path)
+            code_hashes.append([os.path.basename(path), self._code_digests[path]])
+        payload = {
+            'version': CACHE_VERSION,
+            'spec': spec,
+            'code': code_hashes,
+            'fonts': [file_stamp(path) for path in fonts],
+        }
+        blob = json.dumps(payload, sort_keys=True, default=list).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def fetch(self, key, dest):
+        """Copy the cached artifact for `key` to dest; False (a miss) if there is none"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return False
+        # Skip the copy when dest already holds these bytes
+        if not (os.path.exists(dest) and os.path.getsize(dest) == os.path.getsize(path)
+                and file_digest(dest) == file_digest(path)):
+            os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+            shutil.copyfile(path, dest)
+        os.utime(path)
+        self.hits += 1
+        return True
+
+    def store(self, key, src):
+        """Add a freshly rendered file under `key` (atomically, so workers can share a store)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        os.close(fd)
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """Delete least recently used entries until the store fits max_bytes; returns bytes freed"""
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            os.remove(path)
+            freed += size
+        return freed
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"render cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Render many cover variants from one spec file in parallel.
+
+Usage: python tools/render_covers.py tools/specs/covers.json [--workers N] [--out DIR]
+
+The spec is JSON or YAML:
+
+    {
+      "output_dir": "build/covers",          # relative to the spec file
+      "defaults": {"url": "workflowy.ai"},   # merged under every variant
+      "variants": [
+        {"name": "deloitte-linkedin", "platform": "linkedin", "headline": [...], ...}
+      ]
+    }
+
+Each variant is a create_linkedin_cover spec plus a ``name`` (the output
+file stem). Variants sharing a background are batched onto the same
+worker so the background is rendered once and reused. OG share images
+are rendered by create_og_image.py (specs/og_images.json).
+"""
+import argparse
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from create_linkedin_cover import background_key, resolve_spec, save_cover
+from render_cache import DEFAULT_ROOT, RenderCache
+from spec_files import load_spec
+
+BATCH_SIZE = 8
+
+
+def expand_variants(spec):
+    """Merge defaults into each variant, checking names are present and unique"""
+    defaults = spec.get('defaults', {})
+    variants = []
+    seen = set()
+    for variant in spec['variants']:
+        merged = {**defaults, **variant}
+        name = merged.get('name')
+        if not name:
+            raise ValueError(f"Variant without a name: {variant}")
+        if name in seen:
+            raise ValueError(f"Duplicate variant name: {name}")
+        seen.add(name)
+        variants.append(merged)
+    return variants
+
+
+def plan_batches(variants, batch_size=BATCH_SIZE):
+    """Group variants by background, then split each group into batches"""
+    groups = defaultdict(list)
+    for variant in variants:
+        groups[background_key(resolve_spec(variant))].append(variant)
+    batches = []
+    for group in groups.values():
+        for i in range(0, len(group), batch_size):
+            batches.append(group[i:i + batch_size])
+    return batches, len(groups)
+
+
+def render_batch(batch, output_dir, cache_root=None):
+    """Worker: render and save one batch, returning (name, path, seconds, cache_hit) per image"""
+    cache = RenderCache(cache_root) if cache_root else None
+    results = []
+    for variant in batch:
+        start = time.perf_counter()
+        spec = {k: v for k, v in variant.items() if k != 'name'}
+        path = os.path.join(output_dir, f"{variant['name']}.png")
+        hit = save_cover(spec, path, cache)
+        results.append((variant['name'], path, time.perf_counter() - start, hit))
+    return results
+
+
+def render_all(variants, output_dir, workers=None, batch_size=BATCH_SIZE, cache_root=DEFAULT_ROOT):
+    """Render every variant across a process pool, printing per-image timing"""
+    os.makedirs(output_dir, exist_ok=True)
+    batches, backgrounds = plan_batches(variants, batch_size)
+    print(f"{len(variants)} variants, {backgrounds} backgrounds, {len(batches)} batches")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_batch, batch, output_dir, cache_root) for batch in batches]
+        for future in as_completed(futures):
+            for name, path, seconds, hit in future.result():
+                print(f"  {seconds * 1000:7.1f}ms  {'cached' if hit else 'render'}  {path}")
+                results.append((name, path, seconds, hit))
+    elapsed = time.perf_counter() - start
+
+    print(f"Rendered {len(results)} images in {elapsed:.2f}s ({len(results) / elapsed:.1f} images/s)")
+    if cache_root:
+        cache = RenderCache(cache_root)
+        cache.hits = sum(1 for *_, hit in results if hit)
+        cache.misses = len(results) - cache.hits
+        cache.evict()
+        print(cache.summary())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render cover variants from a spec file")
+    parser.add_argument('spec', help='JSON or YAML spec file')
+    parser.add_argument('--out', help='output directory (overrides the spec)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--no-cache', action='store_true', help='always re-render')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    spec = load_spec(args.spec)
+    output_dir = args.out or os.path.normpath(os.path.join(
+        os.path.dirname(os.path.abspath(args.spec)), spec.get('output_dir', 'build')))
+    render_all(expand_variants(spec), output_dir, args.workers, args.batch_size,
+               cache_root=None if args.no_cache else DEFAULT_ROOT)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""HTTP service that renders personalized share cards (OG images) on request.
+
+Usage: python tools/share_service.py [--port 8040] [--workers N] [--processes] [--max-queue 64] [--cache-mb 64]
+
+Endpoints:
+
+- ``GET /card.png``, ``/card.webp``, ``/card@2x.png``, ``/card@2x.webp``:
+  a 1200x630 card (2400x1260 at @2x) from create_og_image. Query
+  parameters override the card's content:
+
+  - variant: start from a named variant in the spec file (--spec)
+  - template, brand, eyebrow, subheadline, url: as in the OG spec
+  - headline: lines separated by ``|``; ``*text*`` is highlighted
+  - tags: comma-separated
+  - partner, partner_color: co-brand name and hex color
+
+  e.g. ``/card.png?variant=og-kpmg&eyebrow=Prepared+for+Jane+Doe``
+- ``GET /metrics``: request counts, latency / render / queue-wait
+  percentiles, in-flight and queued renders, cache size, stage totals (JSON)
+- ``GET /healthz``
+
+Renders run in a bounded thread pool (or process pool with --processes).
+Beyond --max-queue pending renders, new ones are refused with 503.
+Concurrent requests for the same card share one render, and encoded cards
+are kept in an in-memory LRU bounded by --cache-mb and served with
+ETags, so repeat fetches are cache hits or 304s.
+
+Benchmark with tools/bench_share_service.py.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import signal
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlsplit
+
+from create_og_image import DEFAULT_SPEC, TEMPLATES, render_og
+from optimize_assets import WEBP_QUALITY, encode
+from render_covers import expand_variants
+from spec_files import load_spec
+from timing import record, stage
+
+DEFAULT_PORT = 8040
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_CACHE_MB = 64
+# Requests kept for the latency percentiles in /metrics
+LATENCY_WINDOW = 10000
+
+CARD_PATH = re.compile(r'/card(?:@([12])x)?\.(png|webp)')
+CONTENT_TYPES = {'png': 'image/png', 'webp': 'image/webp'}
+TEXT_FIELDS = ('template', 'brand', 'eyebrow', 'subheadline', 'url')
+MAX_FIELD_LENGTH = 200
+MAX_TAGS = 8
+MAX_HEADLINE_LINES = 3
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_headline(value):
+    """'From AI Experimentation|to *AI Execution*' -> OG headline lines (odd segments highlighted)"""
+    lines = []
+    for line in value.split('|')[:MAX_HEADLINE_LINES]:
+        segments = line.split('*')
+        lines.append(segments[0] if len(segments) == 1 else segments)
+    return lines
+
+
+def parse_color(value):
+    if not re.fullmatch(r'#?[0-9a-fA-F]{6}', value):
+        raise BadRequest(f"partner_color must be a hex color like 00338d, not {value!r}")
+    value = value.lstrip('#')
+    return [int(value[i:i + 2], 16) for i in (0, 2, 4)]
+
+
+def card_spec(params, variants):
+    """OG spec for a card request's query parameters (a dict of single values)"""
+    for name, value in params.items():
+        if len(value) > MAX_FIELD_LENGTH:
+            raise BadRequest(f"{name} is longer than {MAX_FIELD_LENGTH} characters")
+    spec = {}
+    if 'variant' in params:
+        if params['variant'] not in variants:
+            raise BadRequest(f"Unknown variant {params['variant']!r}")
+        spec.update(variants[params['variant']])
+    spec.update((field, params[field]) for field in TEXT_FIELDS if field in params)
+    if not spec.get('brand', 'default').strip():
+        raise BadRequest("brand must not be empty")
+    if spec.get('template', 'workflowy') not in TEMPLATES:
+        raise BadRequest(f"Unknown template {spec['template']!r}; expected one of {', '.join(TEMPLATES)}")
+    if 'headline' in params:
+        spec['headline'] = parse_headline(params['headline'])
+    if 'tags' in params:
+        spec['tags'] = [t.strip() for t in params['tags'].split(',') if t.strip()][:MAX_TAGS]
+    if 'partner' in params:
+        spec['partner'] = {'name': params['partner'], 'color': parse_color(params.get('partner_color', '3b82f6'))}
+    return spec
+
+
+def render_card(spec, fmt, scale):
+    """Worker: render and encode one card; returns (bytes, render seconds, stage seconds)"""
+    start = time.perf_counter()
+    with record() as timer:
+        img = render_og(spec, scale)
+        with stage('encode'):
+            if fmt == 'webp':
+                body = encode(img, 'WEBP', quality=WEBP_QUALITY)
+            else:
+                body = encode(img, 'PNG')
+    return body, time.perf_counter() - start, timer.totals
+
+
+def warm_worker():
+    """Process-pool initializer: load fonts and the default background before the first request"""
+    render_og({}, 1)
+
+
+def percentiles(samples):
+    """p50/p90/p99/max (nearest rank) and count of a sequence of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0}
+    pick = lambda p: round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 2)
+    return {'count': len(ordered), 'p50': pick(50), 'p90': pick(90), 'p99': pick(99), 'max': pick(100)}
+
+
+class CardCache:
+    """In-memory LRU of encoded cards: key -> (body, etag), bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, body):
+        entry = (body, f'"{hashlib.sha256(body).hexdigest()[:20]}"')
+        if len(body) > self.max_bytes:
+            return entry
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        self._entries[key] = entry
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ShareService:
+    """Card rendering with request dedupe, an LRU of encoded bytes and metrics"""
+
+    def __init__(self, variants, workers, processes=False, max_queue=DEFAULT_MAX_QUEUE,
+                 cache_bytes=DEFAULT_CACHE_MB << 20):
+        self.variants = variants
+        self.workers = workers
+        self.max_queue = max_queue
+        if processes:
+            self.pool = ProcessPoolExecutor(workers, initializer=warm_worker)
+        else:
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix='render')
+        self.pool_kind = 'process' if processes else 'thread'
+        self.cache = CardCache(cache_bytes)
+        self.inflight = {}   # key -> task rendering that card
+        self.started = time.monotonic()
+        self.counts = {k: 0 for k in ('hit', 'miss', 'joined', 'not_modified', 'rejected',
+                                      'bad_request', 'error')}
+        self.max_pending = 0
+        self.latency = deque(maxlen=LATENCY_WINDOW)
+        self.render_time = deque(maxlen=LATENCY_WINDOW)
+        self.queue_wait = deque(maxlen=LATENCY_WINDOW)
+        self.stages = {}
+
+    async def warm_up(self):
+        if self.pool_kind == 'thread':
+            await asyncio.get_running_loop().run_in_executor(self.pool, warm_worker)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _render(self, key, spec, fmt, scale):
+        submitted = time.perf_counter()
+        try:
+            body, render_seconds, stages = await asyncio.get_running_loop().run_in_executor(
+                self.pool, render_card, spec, fmt, scale)
+        finally:
+            del self.inflight[key]
+        self.render_time.append(render_seconds * 1000)
+        self.queue_wait.append(max(0.0, time.perf_counter() - submitted - render_seconds) * 1000)
+        for name, seconds in stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        return self.cache.put(key, body)
+
+    async def card(self, spec, fmt, scale):
+        """(status, body, etag) for a card: from the cache, a render in flight, or a new render"""
+        key = hashlib.sha256(json.dumps([spec, fmt, scale], sort_keys=True).encode()).hexdigest()
+        entry = self.cache.get(key)
+        if entry is not None:
+            return 'hit', entry
+        task = self.inflight.get(key)
+        if task is not None:
+            return 'joined', await asyncio.shield(task)
+        if len(self.inflight) >= self.workers + self.max_queue:
+            return 'rejected', None
+        task = asyncio.ensure_future(self._render(key, spec, fmt, scale))
+        self.inflight[key] = task
+        self.max_pending = max(self.max_pending, len(self.inflight))
+        return 'miss', await asyncio.shield(task)
+
+    async def respond(self, method, target, headers):
+        """(status, headers, body) for one request"""
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b''
+        url = urlsplit(target)
+        if url.path == '/healthz':
+            return 200, {'Content-Type': 'text/plain'}, b'ok\n'
+        if url.path == '/metrics':
+            body = json.dumps(self.metrics(), indent=2).encode() + b'\n'
+            return 200, {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}, body
+        match = CARD_PATH.fullmatch(url.path)
+        if not match:
+            return 404, {'Content-Type': 'text/plain'}, b'not found\n'
+
+        scale, fmt = int(match.group(1) or 1), match.group(2)
+        try:
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            spec = card_spec(params, self.variants)
+        except BadRequest as e:
+            self.counts['bad_request'] += 1
+            return 400, {'Content-Type': 'text/plain'}, f'{e}\n'.encode()
+        outcome, entry = await self.card(spec, fmt, scale)
+        if outcome == 'rejected':
+            self.counts['rejected'] += 1
+            return 503, {'Retry-After': '1', 'Content-Type': 'text/plain'}, b'render queue full\n'
+
+        body, etag = entry
+        card_headers = {'ETag': etag, 'Cache-Control': 'public, max-age=86400', 'X-Cache': outcome}
+        if headers.get('if-none-match') == etag:
+            self.counts['not_modified'] += 1
+            return 304, card_headers, b''
+        self.counts[outcome] += 1
+        return 200, {**card_headers, 'Content-Type': CONTENT_TYPES[fmt]}, body
+
+    async def handle(self, reader, writer):
+        """One HTTP/1.1 connection: requests until the client closes it or asks to"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get('content-length', 0)):
+                    break   # GET/HEAD only; don't try to skip request bodies
+                try:
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except Exception as e:
+                    self.counts['error'] += 1
+                    status, response_headers, body = 500, {'Content-Type': 'text/plain'}, f'{e}\n'.encode()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = [f'HTTP/1.1 {status} {REASONS[status]}', f'Date: {formatdate(usegmt=True)}',
+                        f'Content-Length: {len(body)}', f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f'{name}: {value}' for name, value in response_headers.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if target.startswith('/card'):
+                    self.latency.append((time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass   # client went away or sent something that isn't HTTP
+        finally:
+            writer.close()
+
+    def metrics(self):
+        return {
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'requests': dict(self.counts),
+            'pool': {'kind': self.pool_kind, 'workers': self.workers, 'max_queue': self.max_queue},
+            'in_flight': len(self.inflight),
+            'queue_depth': max(0, len(self.inflight) - self.workers),
+            'max_queue_depth': max(0, self.max_pending - self.workers),
+            'latency_ms': percentiles(self.latency),
+            'render_ms': percentiles(self.render_time),
+            'queue_wait_ms': percentiles(self.queue_wait),
+            'stage_totals_ms': {name: round(s * 1000, 1) for name, s in self.stages.items()},
+            'cache': {'entries': len(self.cache), 'bytes': self.cache.bytes,
+                      'max_bytes': self.cache.max_bytes, 'evictions': self.cache.evictions},
+        }
+
+
+async def serve(service, host, port, ready=None):
+    """Run the HTTP server until cancelled or sent SIGTERM; calls ready() once it is listening"""
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    await service.warm_up()
+    server = await asyncio.start_server(service.handle, host, port)
+    async with server:
+        if ready:
+            ready()
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass   # SIGTERM: fall through so main() shuts the pool down
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render personalized share cards over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--spec', default=DEFAULT_SPEC, help='OG spec file whose variants ?variant= can name')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='render pool size')
+    parser.add_argument('--processes', action='store_true', help='render in worker processes instead of threads')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help='pending renders beyond the pool size before requests get 503')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB, help='in-memory card cache size')
+    args = parser.parse_args(argv)
+
+    variants = {v['name']: {k: val for k, val in v.items() if k != 'name'}
+                for v in expand_variants(load_spec(args.spec))}
+    service = ShareService(variants, args.workers, args.processes, args.max_queue, args.cache_mb << 20)
+    ready = lambda: print(f"Serving share cards on http://{args.host}:{args.port}/card.png "
+                          f"({args.workers} {service.pool_kind} workers, Ctrl-C to stop)", flush=True)
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
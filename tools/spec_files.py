@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""Loading the JSON/YAML spec files that drive the generators."""
+import json
+
+
+def load_spec(path):
+    """Read a JSON or YAML spec file"""
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("PyYAML is required for YAML specs (pip install pyyaml), or use JSON")
+            return yaml.safe_load(f)
+        return json.load(f)
@@ -0,0 +1,47 @@
+"""Tests for the workflowy-tools daemon: python -m pytest tools/test_workflowy_tools.py"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pytest
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(TOOLS_DIR, 'workflowy_tools.py')
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Socket path of a daemon started for the test"""
+    path = str(tmp_path / 'tools.sock')
+    proc = subprocess.Popen([sys.executable, SCRIPT, '--socket', path, 'serve'],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.monotonic() + 60
+    while not os.path.exists(path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            pytest.fail(f"daemon didn't start: {proc.communicate()[0]}")
+        time.sleep(0.1)
+    yield path
+    proc.terminate()
+    proc.wait(timeout=30)
+
+
+def forwarded(socket_path, *argv):
+    """Exit code and output of a command run through the daemon, with timings blanked"""
+    result = subprocess.run([sys.executable, SCRIPT, '--socket', socket_path, *argv],
+                            capture_output=True, text=True, timeout=120)
+    assert 'running locally' not in result.stderr
+    blank = re.compile(r'\d+\.\d+')
+    return result.returncode, blank.sub('#', result.stdout), blank.sub('#', result.stderr)
+
+
+def test_repeated_command_output_is_identical(daemon, tmp_path):
+    # --profile builds the deck every time (no render cache), so the image library is used each run
+    argv = ['deck', str(tmp_path / 'deck.pptx'), '--profile', str(tmp_path / 'profile')]
+    forwarded(daemon, *argv)   # fills the on-disk image cache, which the runs below share
+    first = forwarded(daemon, *argv)
+    assert first[0] == 0, first[2]
+    assert 'images: 7 placed' in first[1]
+    assert forwarded(daemon, *argv) == first
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Named-stage timing and profiling for the generators.
+
+Generators mark their phases with ``stage()`` (a context manager that also
+works as a decorator), count things with ``tally()`` and time repeated
+units of work (slides) as rows of a per-item table with ``item()``;
+nothing is recorded unless a caller is collecting, so the markers cost
+next to nothing otherwise:
+
+    from timing import item, record, stage, tally
+
+    @stage('encode')
+    def save(img, path): ...
+
+    with stage('background'):
+        ...
+    tally('shapes', len(slide.shapes))
+    with item('slide', 'cover') as row:
+        ...
+        row['shapes'] = len(slide.shapes)
+
+    with record() as timer:
+        render_cover(spec)
+    print(summary_table(timer))
+
+``instrument(profile='build/profile/cover')`` does the same and, given a
+path prefix, also writes ``<prefix>.prof`` (cProfile, for pstats or
+snakeviz) and ``<prefix>.collapsed`` (sampled stacks in the collapsed
+format flamegraph.pl and speedscope read).
+
+The active recorder is held in a context variable, so concurrent threads
+or asyncio tasks each record their own stages.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+_active = ContextVar('timing_recorder', default=None)
+
+# Seconds between stack samples for the collapsed-stack profile
+SAMPLE_INTERVAL = 0.001
+# Per-item tables longer than this show only their slowest rows
+ITEM_ROWS = 20
+
+
+class StageTimer:
+    """Accumulated wall time and call count per stage name, plus tallies, in first-seen order"""
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.tallies = {}   # name -> [total, number of tally() calls]
+        self.nested = set()   # stages that ran inside another stage (already in its total)
+        self.depth = 0
+        self.items = {}   # table -> [(label, seconds, {column: value})], one per item() call
+
+    def add(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def count(self, name, amount):
+        entry = self.tallies.setdefault(name, [0, 0])
+        entry[0] += amount
+        entry[1] += 1
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block (or decorated function) as `name` in the active recorder, if any"""
+    timer = _active.get()
+    if timer is None:
+        yield
+        return
+    if timer.depth:
+        timer.nested.add(name)
+    timer.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.depth -= 1
+        timer.add(name, time.perf_counter() - start)
+
+
+def tally(name, amount=1):
+    """Add `amount` to a named count (e.g. shapes per slide) in the active recorder, if any"""
+    timer = _active.get()
+    if timer is not None:
+        timer.count(name, amount)
+
+
+@contextmanager
+def item(table, label):
+    """Time the enclosed block as one row of a per-item table, if recording
+
+    Yields a dict; whatever is put in it becomes the row's other columns.
+    """
+    timer = _active.get()
+    values = {}
+    if timer is None:
+        yield values
+        return
+    start = time.perf_counter()
+    try:
+        yield values
+    finally:
+        timer.items.setdefault(table, []).append((label, time.perf_counter() - start, values))
+
+
+@contextmanager
+def record(timer=None):
+    """Collect stage timings from the enclosed block into a StageTimer"""
+    timer = timer if timer is not None else StageTimer()
+    token = _active.set(timer)
+    try:
+        yield timer
+    finally:
+        _active.reset(token)
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+@contextmanager
+def profiled(prefix):
+    """cProfile and sample the enclosed block, writing <prefix>.prof and <prefix>.collapsed"""
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(f'{prefix}.prof')
+        sampler.write(f'{prefix}.collapsed')
+
+
+@contextmanager
+def instrument(profile=None):
+    """record() the enclosed block, and profile it too when given a path prefix"""
+    with ExitStack() as stack:
+        timer = stack.enter_context(record())
+        if profile:
+            stack.enter_context(profiled(profile))
+        yield timer
+
+
+def summary_table(timer, extra=()):
+    """Stage totals, calls and per-call time, tallies per call, then (label, value) extra rows"""
+    lines = [f"{'stage':<14}  {'calls':>6}  {'total':>10}  {'per call':>10}"]
+    for name, seconds in timer.totals.items():
+        calls = timer.counts[name]
+        lines.append(f"{name:<14}  {calls:>6}  {seconds * 1000:>8.1f}ms  {seconds * 1000 / calls:>8.2f}ms")
+    for name, (total, calls) in timer.tallies.items():
+        lines.append(f"{name:<14}  {calls:>6}  {total:>10,}  {total / calls:>10.1f}")
+    for label, value in extra:
+        lines.append(f"{label:<14}  {value}")
+    for table, rows in timer.items.items():
+        lines.append('')
+        lines.extend(item_table(table, rows))
+    return '\n'.join(lines)
+
+
+def item_table(table, rows, limit=ITEM_ROWS):
+    """Lines of one per-item table: number, label, ms and the rows' other columns"""
+    columns = list(dict.fromkeys(name for _, _, values in rows for name in values))
+    numbered = list(enumerate(rows, 1))
+    title = table
+    if len(numbered) > limit:
+        numbered = sorted(numbered, key=lambda row: row[1][1], reverse=True)[:limit]
+        title = f"{table} ({limit} slowest of {len(rows)})"
+    lines = [f"{title:<26}  {'ms':>8}" + ''.join(f"  {name:>8}" for name in columns)]
+    for n, (label, seconds, values) in numbered:
+        cells = ''.join(f"  {values.get(name, ''):>8}" for name in columns)
+        lines.append(f"{n:>4}  {label:<20}  {seconds * 1000:>8.1f}{cells}")
+    return lines
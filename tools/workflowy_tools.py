@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""workflowy-tools: one entry point for the generators, with an optional warm daemon.
+
+Usage:
+    tools/workflowy-tools deck [output.pptx] [--spec FILE] [--stream | --incremental | --watch]
+    tools/workflowy-tools cover [output.png]
+    tools/workflowy-tools og [spec] [--out DIR] [--scales 1,2] [--only NAME ...]
+    tools/workflowy-tools covers SPEC | decks CLIENTS | assets [IMAGE ...]
+    tools/workflowy-tools cards [--port 8040]
+    tools/workflowy-tools serve
+
+Run ``tools/workflowy-tools COMMAND --help`` for a command's options.
+Each command imports its generator (and python-pptx / Pillow) only when
+it runs.
+
+``serve`` starts a daemon that imports every generator, scans the fonts
+and keeps them, python-pptx and the rendered-background caches loaded. It
+listens on a Unix socket (build/.workflowy-tools.sock, or
+$WORKFLOWY_TOOLS_SOCKET). While it runs, commands are forwarded to it and
+run there one at a time, in the caller's working directory, so a small
+job costs a socket round trip instead of the imports. ``--local`` runs a
+command in-process even when the daemon is up; ``deck --watch`` and
+``cards`` (the share card HTTP service) always do.
+
+Each forwarded command starts from what a fresh process would have: the
+deck image library (its counters and in-memory images) is reset, and log
+records go to that command's own stderr.
+
+The daemon keeps running the code it imported, while the render caches
+are keyed on the tools sources as they are on disk. So when any tools/*.py
+file changes, the daemon doesn't run the request: the caller runs it
+locally, and the daemon re-executes itself to load the new code.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+# Only the client path is imported up front; the daemon and the generators import lazily
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+DEFAULT_SOCKET = os.environ.get('WORKFLOWY_TOOLS_SOCKET') or \
+    os.path.join(REPO_ROOT, 'build', '.workflowy-tools.sock')
+
+# command -> (module with main(argv), summary)
+COMMANDS = {
+    'deck': ('create_pptx', "build a proposal deck from its slide spec"),
+    'cover': ('create_linkedin_cover', "render the LinkedIn cover image"),
+    'og': ('create_og_image', "render OG share images from a spec file"),
+    'covers': ('render_covers', "render cover variants from a spec file in parallel"),
+    'decks': ('batch_decks', "build one proposal deck per client"),
+    'assets': ('optimize_assets', "optimize social images and write the hashed-asset manifest"),
+    'cards': ('share_service', "serve personalized share cards over HTTP"),
+}
+
+# Long-running commands, never forwarded to the daemon
+LOCAL_COMMANDS = {'cards'}
+
+# Generators the daemon imports up front
+WARM_MODULES = ('create_pptx', 'create_linkedin_cover', 'create_og_image')
+
+
+def run_command(command, argv):
+    """Import a command's module and run its main(argv); returns the exit code"""
+    import importlib
+
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    module = importlib.import_module(COMMANDS[command][0])
+    sys.argv[0] = f'workflowy-tools {command}'   # so the command's usage names itself
+    try:
+        module.main(argv)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+# --- daemon --------------------------------------------------------------------
+
+def source_stamps():
+    """(mtime, size) of every tools module, to notice code edited under a running daemon"""
+    stamps = {}
+    for name in sorted(os.listdir(TOOLS_DIR)):
+        if name.endswith('.py'):
+            st = os.stat(os.path.join(TOOLS_DIR, name))
+            stamps[name] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def warm_up():
+    """Import the generators and load the fonts and python-pptx template they use"""
+    import importlib
+    import logging
+
+    class CurrentStderr(logging.StreamHandler):
+        """Writes to whatever sys.stderr is when a record is logged: the request's, under handle()"""
+
+        def __init__(self):
+            logging.Handler.__init__(self)
+
+        @property
+        def stream(self):
+            return sys.stderr
+
+    # Configured once, here, so the generators' own basicConfig() calls are no-ops
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[CurrentStderr()])
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    for name in WARM_MODULES:
+        importlib.import_module(name)
+
+    from pptx import Presentation
+
+    import create_linkedin_cover
+    from fonts import FAMILIES, registry
+
+    for family, weight in FAMILIES:
+        registry().face(family, weight)
+    for platform in create_linkedin_cover.PLATFORMS.values():
+        create_linkedin_cover.load_fonts(tuple(platform['font_sizes']))
+    Presentation()
+
+
+def reset_request_state():
+    """Put back the per-run state the generators keep in modules, as a fresh process has it"""
+    import deck_images
+
+    images = deck_images.library()
+    images.clear()
+    images.stats.clear()
+
+
+def handle(conn, stamps):
+    """Run one forwarded command and send back its exit code and output
+
+    Returns True, without running it, if the tools sources differ from
+    `stamps` (the caller then runs the command itself).
+    """
+    import io
+    import time
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    with conn.makefile('rb') as f:
+        line = f.readline()
+    if not line:
+        return   # a liveness probe from connect()
+    request = json.loads(line)
+    if source_stamps() != stamps:
+        conn.sendall(json.dumps({'restart': True}).encode())
+        return True
+    stdout, stderr = io.StringIO(), io.StringIO()
+    start = time.perf_counter()
+    cwd = os.getcwd()
+    reset_request_state()
+    try:
+        os.chdir(request['cwd'])
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                code = run_command(request['command'], request['argv'])
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        os.chdir(cwd)
+    elapsed = time.perf_counter() - start
+    print(f"{time.strftime('%H:%M:%S')}  {elapsed * 1000:7.1f}ms  exit {code}  "
+          f"{request['command']} {' '.join(request['argv'])}", flush=True)
+    reply = {'exit': code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+    conn.sendall(json.dumps(reply).encode())
+
+
+def serve(path=DEFAULT_SOCKET):
+    """Warm up, then run forwarded commands one at a time until interrupted"""
+    import signal
+    import time
+
+    if os.path.exists(path):
+        probe = connect(path)
+        if probe is not None:
+            probe.close()
+            raise SystemExit(f"A workflowy-tools daemon is already listening on {path}")
+        os.unlink(path)   # stale socket from a daemon that didn't shut down cleanly
+
+    # Shut down (and remove the socket) on SIGTERM, and on SIGINT even when started with `&`
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    start = time.perf_counter()
+    stamps = source_stamps()   # before importing, so an edit during warm-up counts as a change
+    warm_up()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    print(f"Warmed up in {(time.perf_counter() - start) * 1000:.0f}ms; "
+          f"listening on {path} (Ctrl-C to stop)", flush=True)
+    restart = False
+    try:
+        while not restart:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    restart = handle(conn, stamps)
+                except (OSError, ValueError) as e:   # client went away or sent garbage
+                    print(f"Dropped request: {e}", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(path)
+    if restart:
+        print("Tools sources changed; restarting to load them", flush=True)
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), '--socket', path, 'serve'])
+
+
+# --- client --------------------------------------------------------------------
+
+def connect(path):
+    """A socket connected to the daemon, or None if none is listening"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def forward(path, command, argv):
+    """Run a command on the daemon; returns its exit code, or None if it can't run it here"""
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock:
+        request = {'command': command, 'argv': argv, 'cwd': os.getcwd()}
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile('rb') as f:
+            reply = json.loads(f.read())
+    if reply.get('restart'):
+        print("workflowy-tools: the daemon is reloading changed tools sources; running locally",
+              file=sys.stderr)
+        return None
+    sys.stdout.write(reply['stdout'])
+    sys.stderr.write(reply['stderr'])
+    return reply['exit']
+
+
+def main(argv=None):
+    commands = '\n'.join(f"  {name:<8}{summary}" for name, (_, summary) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='workflowy-tools', formatter_class=argparse.RawDescriptionHelpFormatter,
+        description="Generate Workflowy decks, covers and share images.",
+        epilog=f"commands:\n{commands}\n  serve   keep a warm daemon running that other commands use")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='daemon socket path')
+    parser.add_argument('--local', action='store_true', help="run in this process even if a daemon is up")
+    parser.add_argument('command', choices=[*COMMANDS, 'serve'], metavar='command')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='arguments for the command')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket)
+        return
+    if not args.local and args.command not in LOCAL_COMMANDS and '--watch' not in args.args:
+        code = forward(args.socket, args.command, args.args)
+        if code is not None:
+            sys.exit(code)
+    sys.exit(run_command(args.command, args.args))
+
+
+if __name__ == '__main__':
+    main()